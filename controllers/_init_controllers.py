@@ -0,0 +1,259 @@
+"""Build the controller namespace the interpreter preloads at startup.
+
+This used to live in run.py as a multi-KB source string pushed through
+interpreter.computer.run, which meant re-parsing it (or maintaining a
+hand-rolled marshal cache) on every launch. As a real module, importlib
+compiles it once into __pycache__ and every later startup loads the
+cached bytecode; run.py shrinks to a one-line bootstrap.
+"""
+import builtins
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+
+from controllers.os_controller import OSController
+from controllers.app_controller_macos import MacApp, launch_any_app, windsurf, chrome, safari, vscode, terminal, finder, brave, calculator, docker
+from controllers.ui_controller import SystemUIController
+from controllers.vision_controller import VisionController
+from controllers.gesture_controller import GestureController
+from controllers.calculator_optimized import OptimizedCalculatorController, quick_calculate
+from controllers.calculator_fixed import FixedCalculatorController, fixed_calc
+from controllers.calculator_jxa import jxa_calc, click_calc_buttons, calc_expression, calc_209_x_3909
+from controllers.docker_controller import DockerController, get_docker_controller, quick_container_start, quick_container_stop, quick_container_list
+from controllers.memory import save_doc, list_docs, get_doc, search_docs, get_stats, get_stats_cached, quick_save
+
+
+# browser_controller drags in Playwright and scrapling_controller the
+# Scrapling stack - several seconds of import work between them. Keeping
+# the imports inside these builders moves that cost onto the startup
+# thread pool instead of the critical path.
+def _build_browser():
+    from controllers.browser_controller import BrowserController
+    return BrowserController("policy.yaml", headed=True)
+
+
+def _build_scraper():
+    from controllers.scrapling_controller import ScraplingController
+    scraper = ScraplingController("policy.yaml")
+    # Warm the stealth engine off to the side so the first real
+    # fetch_stealth doesn't pay the headless-browser launch
+    threading.Thread(target=scraper.prewarm, daemon=True).start()
+    return scraper
+
+
+def _import_browser_cls():
+    from controllers.browser_controller import BrowserController
+    return BrowserController
+
+
+def _import_scraper_cls():
+    from controllers.scrapling_controller import ScraplingController
+    return ScraplingController
+
+
+class _LazyController:
+    """Stands in for a controller still being built on a background thread.
+
+    First attribute access blocks on the future and forwards to the real
+    controller, so the prompt appears without waiting for slow
+    constructors.
+    """
+    def __init__(self, future):
+        self._future = future
+
+    def __getattr__(self, name):
+        return getattr(self._future.result(), name)
+
+    def __call__(self, *args, **kwargs):
+        # Lets the proxy wrap classes too: instantiating blocks on the
+        # background import, then constructs as normal
+        return self._future.result()(*args, **kwargs)
+
+    def __repr__(self):
+        return repr(self._future.result())
+
+
+def setup(profile: str = "full") -> Dict[str, Any]:
+    """Construct the controllers and return the names to preload.
+
+    The caller merges the returned dict into the interpreter's Python
+    namespace, so every key here is directly usable by the model.
+
+    profile trims what gets built: "full" is everything, "scrapling"
+    drops the Playwright browser, "basic" drops the web stack entirely.
+    """
+    want_browser = profile == "full"
+    want_scraper = profile in ("full", "scrapling")
+
+    # Independent constructors run concurrently: each does its own I/O
+    # (YAML parse, co-process spawn, SQLite read, Accessibility probe),
+    # so startup pays for the slowest one instead of the sum of all
+    ex = ThreadPoolExecutor(max_workers=8)
+    if want_browser:
+        f_browser = ex.submit(_build_browser)
+        f_browser_cls = ex.submit(_import_browser_cls)
+    if want_scraper:
+        f_scraper = ex.submit(_build_scraper)
+        f_scraper_cls = ex.submit(_import_scraper_cls)
+    f_osctl = ex.submit(OSController, "policy.yaml")
+    f_ui = ex.submit(SystemUIController)
+    f_vision = ex.submit(VisionController)
+    f_gestures = ex.submit(GestureController)
+    f_calc_optimized = ex.submit(OptimizedCalculatorController)
+    f_docker = ex.submit(get_docker_controller)
+    f_docker_web = ex.submit(get_docker_controller, prefer_web=True)
+    f_stats = ex.submit(get_stats_cached)
+
+    # Every controller keeps warming in the background and is bound
+    # through a lazy proxy, so setup() never waits on a slow constructor
+    # (the Docker probe in particular can stall when the daemon is down).
+    # Only the stats block, because the banner below prints them
+    osctl = _LazyController(f_osctl)
+    ui = _LazyController(f_ui)
+    vision = _LazyController(f_vision)
+    gestures = _LazyController(f_gestures)
+    calc_optimized = _LazyController(f_calc_optimized)  # CPU-efficient calculator
+    docker_controller = _LazyController(f_docker)  # Comprehensive Docker controller with UI+CLI fallbacks
+    docker_web_preferred = _LazyController(f_docker_web)  # Web-interface preferred Docker controller
+    memory_stats = f_stats.result()
+    ex.shutdown(wait=False)
+
+    # Cheap constructors stay inline
+    windsurf_app = MacApp("Windsurf")
+    calc = calculator()  # Standard calculator
+    docker_app = docker()  # Native Docker Desktop app controller
+
+    # Disable system() function to force use of automation controllers
+    original_system = getattr(builtins, 'system', None)
+
+    def enhanced_system(command):
+        # rpartition finds the marker and splits in one C-level scan
+        _, marker, rest = command.rpartition('open -a')
+        if marker:
+            app_name = rest.strip().strip('"').strip("'")
+            print(f"🚀 REDIRECTING: system('{command}') → launch_any_app('{app_name}')")
+            print(f"✅ Enhanced with UI automation capabilities")
+            return smart_launch_any_app(app_name)
+        return original_system(command) if original_system else 0
+
+    # Override system function with enhanced version
+    os.system = enhanced_system
+    if hasattr(builtins, 'system'):
+        builtins.system = enhanced_system
+
+    # Enhanced launch_any_app with UI automation for ALL apps
+    def smart_launch_any_app(app_name, path=None):
+        # Build the banner once and emit it as a single write rather
+        # than a flush per line
+        lines = [
+            f"🚀 LAUNCHING {app_name} with full UI automation",
+            f"✅ Available automation:",
+            f"   - MacApp('{app_name}').click_ui('button', 'name')",
+            f"   - MacApp('{app_name}').type_text('content')",
+            f"   - MacApp('{app_name}').menu_click(['File', 'New'])",
+        ]
+
+        if 'Calculator' in app_name:
+            lines += [
+                "🧮 Calculator-specific automation:",
+                "   - calc_optimized.calculate('8208*2083') # CPU-efficient",
+                "   - calc.calculator_click_buttons(['8','2','0','8','*','2','0','8','3','='])",
+            ]
+
+        if 'Docker' in app_name:
+            lines += [
+                "🐳 Docker-specific automation:",
+                "   - docker_controller.start_container('container_name') # UI+CLI fallback",
+                "   - docker_controller.list_containers() # Get all containers",
+                "   - docker_app.docker_open_containers_tab() # Navigate UI",
+            ]
+
+        sys.stdout.write("\n".join(lines) + "\n")
+
+        return launch_any_app(app_name, path)
+
+    # One write for the whole banner: each print is a separate flush on
+    # a line-buffered stream, and the interpreter echoes every chunk
+    sys.stdout.write("\n".join([
+        f"[setup] browser, osctl, windsurf, scraper, Docker, and memory ({memory_stats['total_docs']} docs, {memory_stats['embedding_count']} embeddings) are ready.",
+        "✅ Universal UI automation ready - click anywhere on your laptop!",
+        "🖱️  ui: System-wide clicking, scrolling, Dock/menu bar interaction",
+        "👁️  vision: Screenshot analysis, OCR text reading, image finding",
+        "🤏 gestures: Trackpad swipes, pinch zoom, force touch, smooth movements",
+        "🧮 Calculator app: FULL UI automation available - opens and clicks buttons",
+        "🐳 Docker: FULL automation - UI control + CLI fallbacks + web interface support",
+        "📱 Enhanced app automation with precise coordinate clicking",
+        "⚡ Performance optimized: No busy-loops, exponential backoff, batched commands",
+    ]) + "\n")
+
+    ns: Dict[str, Any] = {
+        # Controller classes and helpers the model calls directly
+        "OSController": OSController,
+        "MacApp": MacApp,
+        "SystemUIController": SystemUIController,
+        "VisionController": VisionController,
+        "GestureController": GestureController,
+        "OptimizedCalculatorController": OptimizedCalculatorController,
+        "FixedCalculatorController": FixedCalculatorController,
+        "DockerController": DockerController,
+        # App factory helpers
+        "chrome": chrome,
+        "safari": safari,
+        "vscode": vscode,
+        "terminal": terminal,
+        "finder": finder,
+        "brave": brave,
+        "calculator": calculator,
+        "docker": docker,
+        # Constructed controller instances
+        "osctl": osctl,
+        "ui": ui,
+        "vision": vision,
+        "gestures": gestures,
+        "calc": calc,
+        "calc_optimized": calc_optimized,
+        "calc_fixed": fixed_calc,  # Robust calculator with proven JXA automation
+        "fixed_calc": fixed_calc,
+        "jxa_calc": jxa_calc,  # PROVEN JXA Calculator automation that WORKS
+        "windsurf": windsurf_app,
+        "docker_app": docker_app,
+        "docker_controller": docker_controller,
+        "docker_web_preferred": docker_web_preferred,
+        # Calculator quick helpers
+        "quick_calculate": quick_calculate,
+        "click_calc_buttons": click_calc_buttons,
+        "calc_expression": calc_expression,
+        "calc_209_x_3909": calc_209_x_3909,
+        # Docker quick helpers
+        "get_docker_controller": get_docker_controller,
+        "quick_container_start": quick_container_start,
+        "quick_container_stop": quick_container_stop,
+        "quick_container_list": quick_container_list,
+        # Memory functions
+        "save_doc": save_doc,
+        "list_docs": list_docs,
+        "get_doc": get_doc,
+        "search_docs": search_docs,
+        "get_stats": get_stats,
+        "get_stats_cached": get_stats_cached,
+        "quick_save": quick_save,
+        "memory_stats": memory_stats,
+        # Launch helpers: launch_any_app keeps the smart wrapper the old
+        # init installed over the raw function
+        "launch_any_app": smart_launch_any_app,
+        "smart_launch_any_app": smart_launch_any_app,
+        "enhanced_system": enhanced_system,
+    }
+
+    # Web stack only for the profiles that asked for it; the classes
+    # resolve from the background imports
+    if want_browser:
+        ns["browser"] = _LazyController(f_browser)
+        ns["BrowserController"] = _LazyController(f_browser_cls)
+    if want_scraper:
+        ns["scraper"] = _LazyController(f_scraper)
+        ns["ScraplingController"] = _LazyController(f_scraper_cls)
+
+    return ns
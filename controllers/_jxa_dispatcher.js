@@ -0,0 +1,128 @@
+/* Consolidated JXA dispatcher for SystemUIController.
+ *
+ * Loaded once into the resident osascript session (or compiled once to
+ * ~/.cache/super_interpreter/ui.scpt via osacompile for the spawn
+ * fallback) so per-call dispatch skips the script parse entirely.
+ * Block comments only: the session loader flattens this file to one line.
+ */
+
+function dispatch(op, args) {
+    const se = Application("System Events");
+    try {
+        if (op === "dockClick") {
+            const appName = args[0];
+            const dock = se.processes["Dock"];
+            if (!dock.exists()) {
+                return JSON.stringify({ok: false, error: "Dock not found"});
+            }
+            const dockItems = dock.windows[0].groups[0].groups;
+            for (const group of dockItems()) {
+                if (group.buttons && group.buttons.length > 0) {
+                    for (const button of group.buttons()) {
+                        const title = String(button.title());
+                        if (title.toLowerCase().includes(appName.toLowerCase())) {
+                            button.click();
+                            return JSON.stringify({ok: true, app: title});
+                        }
+                    }
+                }
+            }
+            return JSON.stringify({ok: false, error: "App not found in Dock"});
+        }
+
+        if (op === "menuBarClick") {
+            const itemName = args[0];
+            const menuBarItems = se.processes["SystemUIServer"].menuBars[0].menuBarItems;
+            for (const item of menuBarItems()) {
+                const title = String(item.title ? item.title() : item.name());
+                if (title.toLowerCase().includes(itemName.toLowerCase())) {
+                    item.click();
+                    return JSON.stringify({ok: true, item: title});
+                }
+            }
+            return JSON.stringify({ok: false, error: "Menu bar item not found"});
+        }
+
+        if (op === "notificationInteract") {
+            const action = args[0];
+            const notifications = se.processes["NotificationCenter"];
+            if (!notifications.exists()) {
+                return JSON.stringify({ok: false, error: "No notifications found"});
+            }
+            const windows = notifications.windows();
+            if (windows.length > 0) {
+                const latestNotification = windows[0];
+                if (action === "click") {
+                    latestNotification.click();
+                } else if (action === "dismiss") {
+                    const buttons = latestNotification.buttons();
+                    for (const btn of buttons) {
+                        if (btn.title() === "Close") {
+                            btn.click();
+                            break;
+                        }
+                    }
+                }
+                return JSON.stringify({ok: true, action: action});
+            }
+            return JSON.stringify({ok: false, error: "No notification windows"});
+        }
+
+        if (op === "findAndClickText") {
+            const searchText = args[0];
+            const appName = args.length > 1 ? args[1] : "";
+
+            function searchInElement(element, depth) {
+                if (depth > 8) return false;
+                try {
+                    const title = String(element.title ? element.title() : element.name()).toLowerCase();
+                    const value = element.value ? String(element.value()).toLowerCase() : "";
+                    if (title.includes(searchText.toLowerCase()) || value.includes(searchText.toLowerCase())) {
+                        if (element.actions && element.actions.byName("AXPress").exists) {
+                            element.actions.byName("AXPress").perform();
+                            return true;
+                        }
+                    }
+                    if (element.uiElements && element.uiElements.length > 0) {
+                        for (const child of element.uiElements()) {
+                            if (searchInElement(child, depth + 1)) return true;
+                        }
+                    }
+                } catch (e) {}
+                return false;
+            }
+
+            const processes = appName ? [se.processes[appName]] : se.processes();
+            for (const process of processes) {
+                for (const window of process.windows()) {
+                    if (searchInElement(window, 0)) {
+                        return JSON.stringify({ok: true, text: searchText});
+                    }
+                }
+            }
+            return JSON.stringify({ok: false, error: "Text not found"});
+        }
+
+        if (op === "getMousePosition") {
+            const pos = se.mouseLocation();
+            return JSON.stringify({ok: true, x: pos[0], y: pos[1]});
+        }
+
+        if (op === "getScreenSize") {
+            const desktops = se.desktops();
+            if (desktops.length > 0) {
+                const bounds = desktops[0].bounds();
+                return JSON.stringify({ok: true, width: bounds[2], height: bounds[3]});
+            }
+            return JSON.stringify({ok: false, error: "No desktop found"});
+        }
+
+        return JSON.stringify({ok: false, error: "Unknown op: " + op});
+    } catch (e) {
+        return JSON.stringify({ok: false, error: e.message});
+    }
+}
+
+function run(argv) {
+    return dispatch(argv[0], argv.slice(1));
+}
@@ -1,6 +1,30 @@
-import json, subprocess, os, time
+import json, subprocess, os, threading, time
+from collections import OrderedDict
+from functools import lru_cache
+from queue import SimpleQueue
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Dict, Any
 
+# Optional PyObjC path: process queries answered by Cocoa in-process are
+# far cheaper than round-tripping through osascript
+try:
+    from AppKit import NSWorkspace, NSApplicationActivationPolicyRegular
+    HAS_APPKIT = True
+except ImportError:
+    HAS_APPKIT = False
+
+def _ax_focused_role() -> str:
+    """Role of the system-wide focused UI element ("" when undetermined)"""
+    from ApplicationServices import (
+        AXUIElementCreateSystemWide, AXUIElementCopyAttributeValue,
+        kAXFocusedUIElementAttribute, kAXRoleAttribute)
+    err, focused = AXUIElementCopyAttributeValue(
+        AXUIElementCreateSystemWide(), kAXFocusedUIElementAttribute, None)
+    if err != 0 or focused is None:
+        return ""
+    err, role = AXUIElementCopyAttributeValue(focused, kAXRoleAttribute, None)
+    return str(role) if err == 0 and role else ""
+
 def _run_jxa(src: str, *args: str) -> str:
     cmd = ["osascript", "-l", "JavaScript", "-e", src, "--"] + list(args)
     res = subprocess.run(cmd, capture_output=True, text=True)
@@ -165,6 +189,14 @@ class MacApp:
         }"""
         return json.loads(_run_jxa(jxa, self.app_name, role or ""))
 
+    # Named keys have to go through `key code`: AppleScript's
+    # keystroke "return" types the six letters, it does not press Enter
+    NAMED_KEY_CODES = {
+        "return": 36, "enter": 36, "tab": 48, "delete": 51,
+        "escape": 53, "esc": 53,
+        "left": 123, "right": 124, "down": 125, "up": 126,
+    }
+
     # ---------- Typing / keystrokes ----------
     def keystroke(self, text: str, modifiers: Optional[List[str]] = None) -> str:
         # Use osascript with AppleScript instead of JXA for better compatibility
@@ -181,10 +213,16 @@ class MacApp:
 
         mod_string = mod_string.rstrip(", ")
 
+        key_code = self.NAMED_KEY_CODES.get(text.lower())
+        if key_code is not None:
+            action = f'key code {key_code}'
+        else:
+            action = f'keystroke "{text}"'
+
         if mod_string:
-            script = f'tell application "System Events" to keystroke "{text}" using {{{mod_string}}}'
+            script = f'tell application "System Events" to {action} using {{{mod_string}}}'
         else:
-            script = f'tell application "System Events" to keystroke "{text}"'
+            script = f'tell application "System Events" to {action}'
 
         cmd = ["osascript", "-e", script]
         res = subprocess.run(cmd, capture_output=True, text=True)
@@ -974,21 +1012,500 @@ def docker() -> MacApp:
     """Get Docker Desktop app instance with enhanced methods"""
     return MacApp("Docker Desktop")
 
+@lru_cache(maxsize=64)
+def _app_full_path(app_name: str) -> Optional[str]:
+    """Resolve an app display name to its bundle path once per session.
+
+    LaunchServices walks its registration database to map a display
+    name to a bundle on every name-based launch; the mapping is stable
+    for a session, so resolve it once and launch by path afterwards.
+    """
+    if not HAS_APPKIT:
+        return None
+    try:
+        return NSWorkspace.sharedWorkspace().fullPathForApplication_(app_name)
+    except Exception:
+        return None
+
 def launch_any_app(app_name: str, path: str = None) -> dict:
     """Launch any macOS application by name, optionally with a file/folder"""
     try:
+        # Direct LaunchServices call when PyObjC is present: /usr/bin/open
+        # only wraps the same API, so going through it pays a fork+exec
+        # and PATH lookup per launch for nothing
+        if HAS_APPKIT and path is None:
+            try:
+                # Launch by resolved bundle path when known, skipping
+                # the LS name lookup on every launch after the first
+                target = _app_full_path(app_name) or app_name
+                if NSWorkspace.sharedWorkspace().launchApplication_(target):
+                    return {"ok": True, "message": f"Launched {app_name}",
+                            "app": app_name, "path": None}
+            except Exception:
+                pass
+            # Name unknown to LaunchServices (or call failed) - let
+            # `open` retry and produce its usual error message
+
         cmd = ['open', '-a', app_name]
         if path:
             cmd.append(path)
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        # posix_spawn skips the fork + interpreter fixups subprocess does
+        # per call; `open` lives at a fixed path so no PATH search either.
+        # Trade-off: stderr isn't captured, so failures only report the
+        # exit status
+        pid = os.posix_spawn('/usr/bin/open', cmd, os.environ)
+        _, status = os.waitpid(pid, 0)
+        exit_code = os.waitstatus_to_exitcode(status)
 
-        if result.returncode == 0:
+        if exit_code == 0:
             message = f"Launched {app_name}"
             if path:
                 message += f" with {path}"
             return {"ok": True, "message": message, "app": app_name, "path": path}
         else:
-            return {"ok": False, "error": f"Failed to launch {app_name}: {result.stderr}"}
+            return {"ok": False, "error": f"Failed to launch {app_name}: open exited with {exit_code}"}
     except Exception as e:
-        return {"ok": False, "error": str(e)}
\ No newline at end of file
+        return {"ok": False, "error": str(e)}
+
+_launch_pool: Optional[ThreadPoolExecutor] = None
+_launch_pool_lock = threading.Lock()
+
+def _get_launch_pool() -> ThreadPoolExecutor:
+    """Shared thread pool for app launches, spawned once and reused.
+
+    A fresh pool per call pays thread creation and teardown on every
+    batch; keeping one alive makes repeated launches only as expensive
+    as the LaunchServices calls themselves.
+    """
+    global _launch_pool
+    if _launch_pool is None:
+        with _launch_pool_lock:
+            if _launch_pool is None:
+                _launch_pool = ThreadPoolExecutor(
+                    max_workers=4, thread_name_prefix="app-launch")
+    return _launch_pool
+
+def launch_apps(app_names: List[str]) -> List[dict]:
+    """Launch several apps concurrently; results come back in input order.
+
+    Each `open -a` blocks on LaunchServices for 200-400ms and the
+    launches are independent, so dispatching them on the shared launch
+    pool cuts wall time from the sum of the latencies to roughly the
+    slowest one.
+    """
+    if not app_names:
+        return []
+    return list(_get_launch_pool().map(launch_any_app, app_names))
+
+class UniversalAppController:
+    """Discover and drive any installed app by name.
+
+    Wraps MacApp with installed-application discovery, so callers can
+    address apps loosely ("chrome", "code") without knowing exact names.
+    """
+
+    APP_DIRS = ["/Applications", "/System/Applications",
+                "/Applications/Utilities", "~/Applications"]
+    _CACHE_FILE = os.path.expanduser("~/.cache/super_interpreter/app_list.json")
+    # Cap on cached MacApp controllers (and the AX references they hold);
+    # overridable for sessions that really do touch more apps
+    MAX_ACTIVE_APPS = int(os.environ.get("SUPER_INTERPRETER_MAX_ACTIVE_APPS", "32"))
+
+    def __init__(self):
+        # Enumeration is deferred until something actually reads app_list;
+        # activate/quit/keystroke paths never pay for it
+        self._app_list = None
+        self._by_exact = {}
+        self._lowered = []
+        self._sorted_names = None  # memoized get_app_list() result
+        # LRU-bounded so a long session doesn't keep controllers alive
+        # for every app it ever touched
+        self.active_apps = OrderedDict()
+
+    @property
+    def app_list(self) -> List[Dict[str, str]]:
+        if self._app_list is None:
+            self._app_list = self._get_all_apps()
+            # Lowercase once at build time: find_app/search_apps run per
+            # user query and should be a dict probe plus one pass, not
+            # N .lower() calls
+            self._by_exact = {a["name"].lower(): a for a in self._app_list}
+            self._lowered = [(a["name"].lower(), a) for a in self._app_list]
+        return self._app_list
+
+    # ---------- App discovery ----------
+    def _scan_dir(self, directory: str) -> List[Dict[str, str]]:
+        """List .app bundles in one directory without per-entry stat calls"""
+        apps = []
+        try:
+            # scandir yields the entry type inline, unlike glob which
+            # stats every entry a second time
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.name.endswith(".app"):
+                        apps.append({"name": entry.name[:-4], "path": entry.path})
+        except OSError:
+            pass
+        return apps
+
+    def _get_all_apps(self) -> List[Dict[str, str]]:
+        """Enumerate installed apps, served from a disk cache when the
+        application directories are unchanged.
+
+        A full walk is thousands of stat calls; the four directory mtimes
+        are enough to detect installs/removals, so a warm start skips the
+        scan entirely.
+        """
+        dirs = [os.path.expanduser(d) for d in self.APP_DIRS]
+        mtimes = {}
+        for d in dirs:
+            try:
+                mtimes[d] = os.stat(d).st_mtime
+            except OSError:
+                mtimes[d] = 0
+
+        try:
+            with open(self._CACHE_FILE) as f:
+                cached = json.load(f)
+            if cached.get("dir_mtime") == mtimes:
+                return cached["apps"]
+        except Exception:
+            pass
+
+        # The scans are I/O-bound; overlapping the four directories hides
+        # per-directory latency on a cold FS cache
+        apps = []
+        with ThreadPoolExecutor(max_workers=4) as ex:
+            for result in ex.map(self._scan_dir, dirs):
+                apps.extend(result)
+        apps.sort(key=lambda a: a["name"].lower())
+
+        try:
+            os.makedirs(os.path.dirname(self._CACHE_FILE), exist_ok=True)
+            with open(self._CACHE_FILE, "w") as f:
+                json.dump({"dir_mtime": mtimes, "apps": apps}, f)
+        except Exception:
+            pass  # cache is best-effort; the scan result is still good
+        return apps
+
+    def find_app(self, query: str) -> Optional[Dict[str, str]]:
+        """Find an installed app by exact, then partial, name match"""
+        self.app_list  # materializes the index on first use
+        ql = query.lower()
+        return self._by_exact.get(ql) or next(
+            (a for lowered, a in self._lowered if ql in lowered), None)
+
+    def search_apps(self, query: str) -> List[Dict[str, str]]:
+        """All installed apps whose name contains the query"""
+        self.app_list
+        ql = query.lower()
+        return [a for lowered, a in self._lowered if ql in lowered]
+
+    def get_app_list(self) -> List[str]:
+        """Sorted app names; built once since the scan result is stable"""
+        if self._sorted_names is None:
+            self._sorted_names = sorted(a["name"] for a in self.app_list)
+        return self._sorted_names
+
+    # ---------- App control ----------
+    def _activate_if_needed(self, controller: MacApp) -> None:
+        """Activate only when the app is not already frontmost.
+
+        Activation is an osascript round trip (~100ms); for repeated
+        commands to the same app it's pure waste. Frontmost is checked
+        via NSWorkspace rather than trusted from our own bookkeeping, so
+        the user switching apps between calls is handled.
+        """
+        if HAS_APPKIT:
+            try:
+                front = NSWorkspace.sharedWorkspace().frontmostApplication()
+                if front is not None and \
+                        str(front.localizedName()) == controller.app_name:
+                    return
+            except Exception:
+                pass
+        controller.activate()
+
+    def get_app_controller(self, app_name: str) -> MacApp:
+        """Get (and cache) a MacApp controller, resolving loose names"""
+        app = self.find_app(app_name)
+        name = app["name"] if app else app_name
+        if name in self.active_apps:
+            self.active_apps.move_to_end(name)
+        else:
+            self.active_apps[name] = MacApp(name)
+            if len(self.active_apps) > self.MAX_ACTIVE_APPS:
+                self.active_apps.popitem(last=False)
+        return self.active_apps[name]
+
+    @staticmethod
+    def _bundle_id(app: Dict[str, str]) -> Optional[str]:
+        """Bundle identifier for an app_list entry, memoized on the entry"""
+        if "bundle_id" in app:
+            return app["bundle_id"]
+        bid = None
+        try:
+            from Foundation import NSBundle
+            bundle = NSBundle.bundleWithPath_(app["path"])
+            if bundle and bundle.bundleIdentifier():
+                bid = str(bundle.bundleIdentifier())
+        except Exception:
+            pass
+        app["bundle_id"] = bid
+        return bid
+
+    def activate_app(self, app_name: str) -> Dict[str, Any]:
+        app = self.find_app(app_name)
+        if HAS_APPKIT and app:
+            # Launch by bundle id: one LaunchServices call, no `open`
+            # subprocess and no osascript
+            try:
+                from AppKit import NSWorkspaceLaunchDefault
+                bid = self._bundle_id(app)
+                if bid:
+                    ws = NSWorkspace.sharedWorkspace()
+                    ok = ws.launchAppWithBundleIdentifier_options_additionalEventParamDescriptor_launchIdentifier_(
+                        bid, NSWorkspaceLaunchDefault, None, None)
+                    if (ok[0] if isinstance(ok, tuple) else ok):
+                        return {"ok": True, "message": f"Launched {app['name']}",
+                                "app": app["name"], "path": None}
+            except Exception:
+                pass
+        return launch_any_app(app["name"] if app else app_name)
+
+    def quit_app(self, app_name: str) -> Dict[str, Any]:
+        app = self.find_app(app_name)
+        name = app["name"] if app else app_name
+        if HAS_APPKIT:
+            # NSRunningApplication.terminate sends the standard quit Apple
+            # Event in one Mach IPC - no osascript, no simulated Cmd-Q
+            try:
+                for ra in NSWorkspace.sharedWorkspace().runningApplications():
+                    if str(ra.localizedName()) == name:
+                        ra.terminate()
+                        return {"ok": True, "app": name}
+            except Exception:
+                pass
+        try:
+            controller = self.get_app_controller(app_name)
+            controller.activate()
+            controller.keystroke("q", ["command"])
+            return {"ok": True, "app": controller.app_name}
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
+    def type_text(self, app_name: str, text: str) -> Dict[str, Any]:
+        try:
+            controller = self.get_app_controller(app_name)
+            self._activate_if_needed(controller)
+            controller.type_text(text)
+            return {"ok": True, "app": controller.app_name, "text": text}
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
+    def send_keystroke(self, app_name: str, key: str,
+                       modifiers: Optional[List[str]] = None) -> Dict[str, Any]:
+        try:
+            controller = self.get_app_controller(app_name)
+            self._activate_if_needed(controller)
+            controller.keystroke(key, modifiers)
+            return {"ok": True, "app": controller.app_name, "key": key}
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
+    def send_string(self, app_name: str, text: str,
+                    settle: float = 0.2) -> Dict[str, Any]:
+        """Type a whole string as one keystroke call.
+
+        One AppleScript `keystroke "2819"` costs the same as a single
+        character, so callers should never loop send_keystroke over
+        digits with per-character sleeps - a single settle delay after
+        the full string is all apps like Calculator need.
+        """
+        try:
+            controller = self.get_app_controller(app_name)
+            self._activate_if_needed(controller)
+            controller.keystroke(text)
+            if settle:
+                time.sleep(settle)
+            return {"ok": True, "app": controller.app_name, "text": text}
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
+    def click_menu(self, app_name: str, path: List[str]) -> Dict[str, Any]:
+        try:
+            controller = self.get_app_controller(app_name)
+            self._activate_if_needed(controller)
+            return controller.menu_click(path)
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
+    def get_running_apps(self) -> List[str]:
+        """Names of apps the user would see as running (no background-only)"""
+        if HAS_APPKIT:
+            try:
+                # Direct Cocoa query: no subprocess, no System Events
+                # "whose" clause, and no locale-fragile string splitting
+                ws = NSWorkspace.sharedWorkspace()
+                return sorted(
+                    str(a.localizedName()) for a in ws.runningApplications()
+                    if a.activationPolicy() == NSApplicationActivationPolicyRegular)
+            except Exception:
+                pass
+        try:
+            script = ('tell application "System Events" to get name of '
+                      'every process whose background only is false')
+            res = subprocess.run(["osascript", "-e", script],
+                                 capture_output=True, text=True)
+            if res.returncode != 0:
+                return []
+            return sorted(n.strip() for n in res.stdout.split(",") if n.strip())
+        except Exception:
+            return []
+
+    _JXA_MODS = {"command": "command down", "cmd": "command down",
+                 "shift": "shift down", "option": "option down",
+                 "alt": "option down", "control": "control down",
+                 "ctrl": "control down"}
+
+    def _compile_batch(self, app_name: str,
+                       operations: List[Dict[str, Any]]) -> Optional[str]:
+        """Emit one JXA program running the whole op sequence, or None if
+        an op cannot be expressed in pure JXA"""
+        lines = [
+            "function run(argv){",
+            '  const se = Application("System Events");',
+            f"  Application({json.dumps(app_name)}).activate();",
+            "  const results = [];",
+        ]
+        for op in operations:
+            kind = op.get("type")
+            if kind == "type":
+                call = f"se.keystroke({json.dumps(op.get('text', ''))})"
+            elif kind == "keystroke":
+                mods = [self._JXA_MODS[m] for m in (op.get("modifiers") or [])
+                        if m in self._JXA_MODS]
+                using = f", {{using: {json.dumps(mods)}}}" if mods else ""
+                call = f"se.keystroke({json.dumps(op.get('key', ''))}{using})"
+            else:
+                return None  # menu paths etc. keep the per-op fallback
+            lines.append(f"  try {{ {call}; results.push({{ok:true, op:{json.dumps(kind)}}}); }}"
+                         " catch(e){ results.push({ok:false, error:e.message}); }")
+            if op.get("wait"):
+                lines.append(f"  delay({float(op['wait'])});")
+        lines.append("  return JSON.stringify(results);")
+        lines.append("}")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _coalesce(operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Merge runs of typing into single ops.
+
+        Consecutive type ops and bare single-character keystrokes all end
+        up as keystroke text at the System Events boundary, so
+        [type "hello", keystroke " ", type "world"] can be one op and one
+        round trip instead of three. An op carrying a nonzero wait ends
+        its run: nothing merges across a deliberate pause.
+        """
+        merged = []
+        for op in operations:
+            if op.get("type") == "keystroke" and not op.get("modifiers") \
+                    and len(op.get("key") or "") == 1:
+                op = {"type": "type", "text": op["key"], "wait": op.get("wait", 0)}
+            else:
+                op = dict(op)
+            prev = merged[-1] if merged else None
+            if prev is not None and op.get("type") == "type" \
+                    and prev.get("type") == "type" and not prev.get("wait"):
+                prev["text"] = prev.get("text", "") + op.get("text", "")
+                prev["wait"] = op.get("wait", 0)
+            else:
+                merged.append(op)
+        return merged
+
+    def batch_app_operation(self, app_name: str,
+                            operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run a sequence of ops ({type, text/key/path, modifiers, wait})
+        against one app"""
+        operations = self._coalesce(operations)
+        controller = self.get_app_controller(app_name)
+        # Preferred path: the entire sequence runs inside one osascript
+        # process instead of paying a spawn per op
+        script = self._compile_batch(controller.app_name, operations)
+        if script is not None:
+            try:
+                return json.loads(_run_jxa(script))
+            except Exception:
+                pass  # fall back to the per-op loop
+        self._activate_if_needed(controller)
+
+        # Per-op fallback, pipelined: a consumer thread drains the queue
+        # while this thread keeps marshaling the next op, so Python-side
+        # prep overlaps osascript latency. SimpleQueue keeps FIFO order,
+        # and waits ride the queue as sentinels so they still happen
+        # between the ops they separate.
+        ops_q = SimpleQueue()
+        results = []
+
+        def _run_op(op):
+            kind = op.get("type")
+            if kind == "type":
+                controller.type_text(op.get("text", ""))
+                return {"ok": True, "op": kind}
+            if kind == "keystroke":
+                controller.keystroke(op.get("key", ""), op.get("modifiers"))
+                return {"ok": True, "op": kind}
+            if kind == "menu":
+                return controller.menu_click(op.get("path", []))
+            return {"ok": False, "error": f"Unknown op type: {kind}"}
+
+        def _consume():
+            while True:
+                op = ops_q.get()
+                if op is None:
+                    return
+                if op.get("type") == "_sleep":
+                    time.sleep(op["wait"])
+                    continue
+                try:
+                    results.append(_run_op(op))
+                except Exception as e:
+                    results.append({"ok": False, "error": str(e)})
+
+        consumer = threading.Thread(target=_consume, daemon=True)
+        consumer.start()
+        for op in operations:
+            ops_q.put(op)
+            if op.get("wait"):
+                ops_q.put({"type": "_sleep", "wait": op["wait"]})
+        ops_q.put(None)
+        consumer.join()
+        return results
+
+    def execute_in_terminal_app(self, command: str,
+                                app_name: str = "Terminal") -> Dict[str, Any]:
+        """Type and run a shell command in a terminal app"""
+        try:
+            controller = self.get_app_controller(app_name)
+            self._activate_if_needed(controller)
+            # Wait for the terminal's input area to take focus rather
+            # than sleeping a fixed half second
+            if HAS_APPKIT:
+                try:
+                    deadline = time.time() + 2.0
+                    while time.time() < deadline and _ax_focused_role() \
+                            not in ("AXTextArea", "AXTextField"):
+                        time.sleep(0.02)
+                except Exception:
+                    time.sleep(0.5)
+            else:
+                time.sleep(0.5)
+            controller.type_text(command)
+            controller.keystroke("return")
+            return {"ok": True, "app": controller.app_name, "command": command}
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
+def create_universal_app_controller() -> UniversalAppController:
+    return UniversalAppController()
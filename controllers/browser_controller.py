@@ -1,12 +1,51 @@
 from playwright.sync_api import sync_playwright, Page, BrowserContext
 from pathlib import Path
-from typing import Optional, Dict, Any
-import re, yaml, subprocess
+from typing import Optional, Dict, Any, List
+import atexit, re, yaml, subprocess
 import nest_asyncio
 
 # Apply nest_asyncio to allow Playwright to run in existing asyncio loop
 nest_asyncio.apply()
 
+# Check if we have PyObjC for direct LaunchServices URL opens
+HAS_APPKIT = False
+try:
+    from AppKit import NSWorkspace
+    from Foundation import NSURL
+    HAS_APPKIT = True
+except ImportError:
+    pass
+
+# LaunchServices addresses apps by bundle id, not display name
+_BROWSER_BUNDLE_IDS = {
+    "Google Chrome": "com.google.Chrome",
+    "Brave Browser": "com.brave.Browser",
+    "Safari": "com.apple.Safari",
+    "Firefox": "org.mozilla.firefox",
+}
+
+def _open_urls_via_workspace(urls: List[str], browser_name: str) -> bool:
+    """Hand URLs straight to LaunchServices, skipping the `open` spawn.
+
+    /usr/bin/open just wraps this same API, so when PyObjC is around a
+    fork+exec per open is pure overhead. Returns False when the browser
+    has no known bundle id or the call fails, so callers can fall back.
+    """
+    if not HAS_APPKIT:
+        return False
+    bundle_id = _BROWSER_BUNDLE_IDS.get(browser_name)
+    if not bundle_id:
+        return False
+    try:
+        ns_urls = [NSURL.URLWithString_(u) for u in urls]
+        if any(u is None for u in ns_urls):
+            return False
+        ws = NSWorkspace.sharedWorkspace()
+        return bool(ws.openURLs_withAppBundleIdentifier_options_additionalEventParamDescriptor_launchIdentifiers_(
+            ns_urls, bundle_id, 0, None, None))
+    except Exception:
+        return False
+
 class BrowserController:
     _pw = None
     _browser = None
@@ -30,6 +69,27 @@ class BrowserController:
         if not self._page:
             self._page = self._ctx.new_page()
 
+    def close(self) -> Dict[str, Any]:
+        """Shut down the page/context/browser/playwright stack"""
+        try:
+            for attr in ("_page", "_ctx", "_browser"):
+                obj = getattr(self, attr)
+                if obj:
+                    try:
+                        obj.close()
+                    except Exception:
+                        pass
+                    setattr(self, attr, None)
+            if self._pw:
+                try:
+                    self._pw.stop()
+                except Exception:
+                    pass
+                self._pw = None
+            return {"ok": True}
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
     def _is_allowed(self, url: str) -> bool:
         domain = re.sub(r"^https?://", "", url).split("/")[0]
         return any(domain.endswith(d) for d in self.allowed)
@@ -123,6 +183,14 @@ class BrowserController:
         browser_name = browser_map.get(browser.lower(), browser)
 
         try:
+            if _open_urls_via_workspace([url], browser_name):
+                return {
+                    "ok": True,
+                    "message": f"Opened {url} in {browser_name}",
+                    "url": url,
+                    "browser": browser_name
+                }
+
             result = subprocess.run(['open', '-a', browser_name, url],
                                   capture_output=True, text=True)
 
@@ -138,6 +206,50 @@ class BrowserController:
         except Exception as e:
             return {"ok": False, "error": str(e)}
 
+    def open_urls_in_native_browser(self, urls: List[str], browser: str = "chrome") -> Dict[str, Any]:
+        """Open several URLs in the native browser with a single `open` call.
+
+        `open -a` accepts multiple documents, so N tabs cost one process
+        spawn and one LaunchServices round-trip instead of N.
+        """
+        browser_map = {
+            "chrome": "Google Chrome",
+            "brave": "Brave Browser",
+            "safari": "Safari",
+            "firefox": "Firefox"
+        }
+
+        if not urls:
+            return {"ok": False, "error": "No URLs given"}
+
+        urls = [u if u.startswith(('http://', 'https://')) else f'https://{u}'
+                for u in urls]
+        browser_name = browser_map.get(browser.lower(), browser)
+
+        try:
+            if _open_urls_via_workspace(urls, browser_name):
+                return {
+                    "ok": True,
+                    "message": f"Opened {len(urls)} URLs in {browser_name}",
+                    "urls": urls,
+                    "browser": browser_name
+                }
+
+            result = subprocess.run(['open', '-a', browser_name, *urls],
+                                  capture_output=True, text=True)
+
+            if result.returncode == 0:
+                return {
+                    "ok": True,
+                    "message": f"Opened {len(urls)} URLs in {browser_name}",
+                    "urls": urls,
+                    "browser": browser_name
+                }
+            else:
+                return {"ok": False, "error": f"Failed to open {browser_name}: {result.stderr}"}
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
     def docker_web_interface(self, port: int = 9000) -> Dict[str, Any]:
         """Navigate to Docker's web interface (like Portainer)"""
         docker_url = f"http://localhost:{port}"
@@ -286,3 +398,16 @@ class BrowserController:
 
         except Exception as e:
             return {"ok": False, "error": str(e)}
+
+# ---------- Shared instances ----------
+# Chromium startup is 300-800ms, so demos and scripts should share one
+# controller per headed flag instead of launching a fresh browser each.
+_BROWSERS: Dict[bool, BrowserController] = {}
+
+def get_browser(policy_path: str = "policy.yaml", headed: bool = False) -> BrowserController:
+    """Shared BrowserController, memoized per headed flag and closed at exit"""
+    if headed not in _BROWSERS:
+        browser = BrowserController(policy_path, headed=headed)
+        atexit.register(browser.close)
+        _BROWSERS[headed] = browser
+    return _BROWSERS[headed]
@@ -34,12 +34,15 @@ class OptimizedCalculatorController:
             try:
                 command = self.command_queue.get(timeout=1.0)  # Block, don't spin
 
-                # Ensure Calculator is active
-                if not calculator_active:
+                # Ensure Calculator is active. For type_expression the
+                # activation is folded into the generated script so the
+                # whole sequence is one osascript spawn instead of two.
+                need_activate = not calculator_active
+                if need_activate and command.action != "type_expression":
                     self._activate_calculator()
-                    calculator_active = True
+                calculator_active = True
 
-                result = self._execute_command(command)
+                result = self._execute_command(command, need_activate)
 
                 if command.result_queue:
                     command.result_queue.put(result)
@@ -63,11 +66,13 @@ class OptimizedCalculatorController:
         """
         subprocess.run(["osascript", "-e", script], check=False, capture_output=True)
 
-    def _execute_command(self, command: CalculatorCommand) -> Dict[str, Any]:
+    def _execute_command(self, command: CalculatorCommand,
+                         need_activate: bool = False) -> Dict[str, Any]:
         """Execute single Calculator command"""
         try:
             if command.action == "type_expression":
-                return self._type_expression_direct(command.payload)
+                return self._type_expression_direct(command.payload,
+                                                    activate=need_activate)
             elif command.action == "click_buttons":
                 return self._click_buttons_batch(command.payload)
             elif command.action == "clear":
@@ -79,13 +84,23 @@ class OptimizedCalculatorController:
         except Exception as e:
             return {"ok": False, "error": str(e)}
 
-    def _type_expression_direct(self, expression: str) -> Dict[str, Any]:
-        """Type entire expression in one AppleScript call"""
+    def _type_expression_direct(self, expression: str,
+                                activate: bool = False) -> Dict[str, Any]:
+        """Type entire expression in one AppleScript call.
+
+        With activate=True the activation (and its delay) is baked into
+        the same script - the full activate/clear/type sequence then
+        costs a single osascript spawn.
+        """
         # Escape quotes and special characters
         escaped_expr = expression.replace('"', '\\"').replace('\\', '\\\\')
 
+        activate_prefix = ""
+        if activate:
+            activate_prefix = 'tell application "Calculator" to activate\ndelay 0.3\n'
+
         script = f"""
-        tell application "System Events"
+        {activate_prefix}tell application "System Events"
             keystroke "c" using command down
             delay 0.1
             keystroke "{escaped_expr}"
@@ -266,25 +281,21 @@ class OptimizedCalculatorController:
 
 # Convenience functions for quick calculations
 
+# Quick helpers share the module singleton below: a controller per call
+# meant spinning up and tearing down the worker thread every time, which
+# dwarfed the actual AppleScript work
+
 def quick_calculate(expression: str) -> str:
     """Quick calculation with automatic result extraction"""
-    calc = OptimizedCalculatorController()
-    try:
-        result = calc.calculate(expression)
-        if result["ok"]:
-            return result["result"]
-        else:
-            return f"Error: {result['error']}"
-    finally:
-        calc.shutdown()
+    result = optimized_calculator.calculate(expression)
+    if result["ok"]:
+        return result["result"]
+    else:
+        return f"Error: {result['error']}"
 
 def quick_button_sequence(buttons: List[str]) -> Dict[str, Any]:
     """Quick button sequence"""
-    calc = OptimizedCalculatorController()
-    try:
-        return calc.click_buttons_sequence(buttons)
-    finally:
-        calc.shutdown()
+    return optimized_calculator.click_buttons_sequence(buttons)
 
 # Singleton for global use
 optimized_calculator = OptimizedCalculatorController()
\ No newline at end of file
@@ -2,8 +2,20 @@ import json
 import subprocess
 import time
 import math
+from functools import lru_cache
+from shutil import which
 from typing import List, Optional, Dict, Any, Tuple
 
+@lru_cache(maxsize=1)
+def _cliclick_path() -> Optional[str]:
+    """Path to cliclick if installed - one PATH scan, cached for the session.
+
+    Every gesture used to fork a `which cliclick` subprocess just to
+    test for the binary; shutil.which answers the same question with a
+    handful of stat calls and the answer does not change mid-session.
+    """
+    return which("cliclick")
+
 class GestureController:
     """Advanced trackpad and mouse gesture automation for macOS"""
 
@@ -48,7 +60,8 @@ class GestureController:
             # Use cliclick if available for more precise control
             try:
                 # Check if cliclick is installed
-                subprocess.run(["which", "cliclick"], check=True, capture_output=True)
+                if _cliclick_path() is None:
+                    raise FileNotFoundError("cliclick not installed")
 
                 # Calculate swipe parameters
                 base_distance = int(100 * distance)  # Base distance in pixels
@@ -103,7 +116,8 @@ class GestureController:
 
             try:
                 # Check if cliclick is available
-                subprocess.run(["which", "cliclick"], check=True, capture_output=True)
+                if _cliclick_path() is None:
+                    raise FileNotFoundError("cliclick not installed")
 
                 # Simulate pinch gesture with mouse movements
                 if zoom_type == "in":
@@ -156,7 +170,8 @@ class GestureController:
 
             try:
                 # Check if cliclick is available
-                subprocess.run(["which", "cliclick"], check=True, capture_output=True)
+                if _cliclick_path() is None:
+                    raise FileNotFoundError("cliclick not installed")
 
                 # Simulate multi-finger tap by clicking multiple nearby points
                 offsets = [
@@ -217,7 +232,8 @@ class GestureController:
 
             try:
                 # Check if cliclick is available
-                subprocess.run(["which", "cliclick"], check=True, capture_output=True)
+                if _cliclick_path() is None:
+                    raise FileNotFoundError("cliclick not installed")
 
                 # Simulate force touch with long press
                 cmd = ["cliclick", f"dd:{x},{y}", f"du:{x},{y}"]
@@ -269,7 +285,8 @@ class GestureController:
 
             try:
                 # Check if cliclick is available
-                subprocess.run(["which", "cliclick"], check=True, capture_output=True)
+                if _cliclick_path() is None:
+                    raise FileNotFoundError("cliclick not installed")
 
                 # Move to starting position
                 subprocess.run(["cliclick", f"m:{from_x},{from_y}"])
@@ -317,7 +334,8 @@ class GestureController:
         try:
             try:
                 # Check if cliclick is available
-                subprocess.run(["which", "cliclick"], check=True, capture_output=True)
+                if _cliclick_path() is None:
+                    raise FileNotFoundError("cliclick not installed")
 
                 # Move to position first
                 subprocess.run(["cliclick", f"m:{x},{y}"])
@@ -390,7 +408,8 @@ class GestureController:
 
             try:
                 # Check if cliclick is available
-                subprocess.run(["which", "cliclick"], check=True, capture_output=True)
+                if _cliclick_path() is None:
+                    raise FileNotFoundError("cliclick not installed")
 
                 # Start drag
                 subprocess.run(["cliclick", f"dd:{from_x},{from_y}"])
@@ -449,7 +468,8 @@ class GestureController:
 
             try:
                 # Check if cliclick is available
-                subprocess.run(["which", "cliclick"], check=True, capture_output=True)
+                if _cliclick_path() is None:
+                    raise FileNotFoundError("cliclick not installed")
 
                 # Start at top of circle
                 start_x = center_x
@@ -529,11 +549,7 @@ class GestureController:
         dependencies = {}
 
         # Check for cliclick
-        try:
-            result = subprocess.run(["which", "cliclick"], capture_output=True)
-            dependencies["cliclick"] = result.returncode == 0
-        except:
-            dependencies["cliclick"] = False
+        dependencies["cliclick"] = _cliclick_path() is not None
 
         return {
             "ok": True,
@@ -1,4 +1,5 @@
 import os, sqlite3, time, json, hashlib, math
+from collections import OrderedDict
 from typing import Optional, List, Dict, Any
 import logging
 
@@ -18,6 +19,26 @@ try:
 except ImportError:
     logger.info("📝 OpenAI not available - using text-only storage")
 
+# Check if we have orjson for faster meta (de)serialization
+try:
+    import orjson
+
+    def _dumps_meta(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    def _loads_meta(raw) -> Dict[str, Any]:
+        return orjson.loads(raw) if raw else {}
+except ImportError:
+    def _dumps_meta(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    def _loads_meta(raw) -> Dict[str, Any]:
+        if not raw:
+            return {}
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8")
+        return json.loads(raw)
+
 # Check if we have sqlite-vss for vector search
 HAS_VSS = False
 try:
@@ -43,13 +64,43 @@ CREATE TABLE IF NOT EXISTS docs(
   title TEXT,
   content TEXT,
   content_hash TEXT,            -- to avoid duplicate embeddings
-  meta TEXT,                    -- JSON
+  meta BLOB,                    -- JSON (bytes; orjson when available)
   created_at REAL
 );
 
-CREATE INDEX IF NOT EXISTS idx_docs_namespace ON docs(namespace);
+-- Composite (namespace, id DESC) serves both the filter and the
+-- ORDER BY id DESC in list_docs without a temp b-tree, and replaces
+-- the old single-column namespace index
+DROP INDEX IF EXISTS idx_docs_namespace;
+CREATE INDEX IF NOT EXISTS idx_docs_ns_id ON docs(namespace, id DESC);
 CREATE INDEX IF NOT EXISTS idx_docs_created_at ON docs(created_at);
 CREATE INDEX IF NOT EXISTS idx_docs_hash ON docs(content_hash);
+
+CREATE TABLE IF NOT EXISTS embedding_cache(
+  hash TEXT PRIMARY KEY,        -- content hash, decoupled from docs lifecycle
+  embedding BLOB                -- serialized embedding for dedup/reuse
+);
+
+CREATE TABLE IF NOT EXISTS stats(
+  namespace TEXT PRIMARY KEY,
+  doc_count INTEGER DEFAULT 0,
+  emb_count INTEGER DEFAULT 0
+) WITHOUT ROWID;
+
+-- Seed stats from an existing database that predates the counter table
+INSERT INTO stats(namespace, doc_count)
+  SELECT namespace, COUNT(*) FROM docs
+  WHERE NOT EXISTS(SELECT 1 FROM stats)
+  GROUP BY namespace;
+
+CREATE TRIGGER IF NOT EXISTS docs_ai AFTER INSERT ON docs BEGIN
+  INSERT INTO stats(namespace, doc_count) VALUES(NEW.namespace, 1)
+    ON CONFLICT(namespace) DO UPDATE SET doc_count = doc_count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS docs_ad AFTER DELETE ON docs BEGIN
+  UPDATE stats SET doc_count = doc_count - 1 WHERE namespace = OLD.namespace;
+END;
 """
 
 VSS_SCHEMA = """
@@ -57,6 +108,17 @@ CREATE VIRTUAL TABLE IF NOT EXISTS docs_embeddings USING vss0(
   embedding(1536),              -- OpenAI embedding dimension
   doc_id INTEGER
 );
+
+-- Seed emb_count from embeddings that predate the counter table; must
+-- live here rather than in SCHEMA because the embeddings table only
+-- exists on this path. Guarded so it runs once: counters all zero while
+-- embedding rows exist can only mean an unseeded legacy database
+UPDATE stats SET emb_count = (
+    SELECT COUNT(*) FROM docs_embeddings e
+    JOIN docs d ON e.doc_id = d.id
+    WHERE d.namespace = stats.namespace)
+WHERE (SELECT COALESCE(SUM(emb_count), 0) FROM stats) = 0
+  AND EXISTS(SELECT 1 FROM docs_embeddings);
 """
 
 # Fallback schema for embeddings without VSS
@@ -68,6 +130,28 @@ CREATE TABLE IF NOT EXISTS docs_embeddings_simple(
   FOREIGN KEY (doc_id) REFERENCES docs(id) ON DELETE CASCADE
 );
 CREATE INDEX IF NOT EXISTS idx_embeddings_doc_id ON docs_embeddings_simple(doc_id);
+
+CREATE TRIGGER IF NOT EXISTS docs_emb_ai AFTER INSERT ON docs_embeddings_simple BEGIN
+  INSERT INTO stats(namespace, emb_count)
+    VALUES((SELECT namespace FROM docs WHERE id = NEW.doc_id), 1)
+    ON CONFLICT(namespace) DO UPDATE SET emb_count = emb_count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS docs_emb_ad AFTER DELETE ON docs_embeddings_simple BEGIN
+  UPDATE stats SET emb_count = emb_count - 1
+    WHERE namespace = (SELECT namespace FROM docs WHERE id = OLD.doc_id);
+END;
+
+-- Seed emb_count from embeddings that predate the counter table; must
+-- live here rather than in SCHEMA because the embeddings table only
+-- exists on this path. Guarded so it runs once: counters all zero while
+-- embedding rows exist can only mean an unseeded legacy database
+UPDATE stats SET emb_count = (
+    SELECT COUNT(*) FROM docs_embeddings_simple e
+    JOIN docs d ON e.doc_id = d.id
+    WHERE d.namespace = stats.namespace)
+WHERE (SELECT COALESCE(SUM(emb_count), 0) FROM stats) = 0
+  AND EXISTS(SELECT 1 FROM docs_embeddings_simple);
 """
 
 def _conn():
@@ -87,7 +171,7 @@ def _conn():
             con.enable_load_extension(True)
             sqlite_vss.load(con)
             con.enable_load_extension(False)
-            con.execute(VSS_SCHEMA)
+            con.executescript(VSS_SCHEMA)
         except Exception as e:
             logger.warning(f"Could not create VSS table: {e}")
     elif HAS_OPENAI:
@@ -96,8 +180,8 @@ def _conn():
 
     return con
 
-def _get_embedding(text: str) -> Optional[List[float]]:
-    """Get OpenAI embedding for text"""
+def _fetch_embedding(text: str) -> Optional[List[float]]:
+    """Get OpenAI embedding for text (network call)"""
     if not HAS_OPENAI:
         return None
 
@@ -112,9 +196,61 @@ def _get_embedding(text: str) -> Optional[List[float]]:
         logger.error(f"Failed to get embedding: {e}")
         return None
 
+# Session-level LRU over the network fetch; the same query text recurs
+# across a session so don't pay the API round trip twice. Failures are
+# deliberately not cached so transient errors can retry.
+_embedding_lru: "OrderedDict[str, List[float]]" = OrderedDict()
+_EMBEDDING_LRU_MAX = 2048
+
+def _get_embedding(text: str, con: Optional[sqlite3.Connection] = None) -> Optional[List[float]]:
+    """Get embedding for text, consulting memory and disk caches first.
+
+    Callers that already hold a connection must pass it in: opening a
+    second connection while the caller has an uncommitted write
+    transaction deadlocks on the database lock, so the cache write has
+    to ride on the caller's transaction instead.
+    """
+    if not HAS_OPENAI:
+        return None
+
+    key = _content_hash(text)
+    if key in _embedding_lru:
+        _embedding_lru.move_to_end(key)
+        return _embedding_lru[key]
+
+    # Persisted across sessions in the embedding_cache table
+    own_con = con is None
+    if own_con:
+        con = _conn()
+    row = con.execute("SELECT embedding FROM embedding_cache WHERE hash = ?", (key,)).fetchone()
+    embedding = None
+    if row:
+        try:
+            embedding = json.loads(row[0])
+        except Exception:
+            embedding = None
+
+    if embedding is None:
+        embedding = _fetch_embedding(text)
+        if embedding:
+            con.execute("INSERT OR IGNORE INTO embedding_cache(hash, embedding) VALUES(?, ?)",
+                        (key, json.dumps(embedding).encode("utf-8")))
+            if own_con:
+                con.commit()
+    if own_con:
+        con.close()
+
+    if embedding:
+        _embedding_lru[key] = embedding
+        if len(_embedding_lru) > _EMBEDDING_LRU_MAX:
+            _embedding_lru.popitem(last=False)
+    return embedding
+
 def _content_hash(content: str) -> str:
     """Generate hash for content to avoid duplicate embeddings"""
-    return hashlib.sha256(content.encode()).hexdigest()[:16]
+    # blake2b is faster than sha256 and a 16-byte digest already gives 128 bits,
+    # so no need to slice the hex string down afterwards
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
 
 def _cosine_similarity(a: List[float], b: List[float]) -> float:
     """Calculate cosine similarity between two vectors"""
@@ -136,33 +272,47 @@ def save_doc(namespace: str, title: str, content: str, meta: Dict[str,Any] = {})
     cur.execute("""
         INSERT INTO docs(namespace,title,content,content_hash,meta,created_at)
         VALUES(?,?,?,?,?,?)
-    """, (namespace, title, content, content_hash, json.dumps(meta), time.time()))
+    """, (namespace, title, content, content_hash, _dumps_meta(meta), time.time()))
 
     doc_id = cur.lastrowid
 
     # Create embedding if possible
     if HAS_OPENAI:
         try:
-            # Check if we already have an embedding for this content
-            if HAS_VSS:
-                table_check = "SELECT 1 FROM docs_embeddings WHERE doc_id IN (SELECT id FROM docs WHERE content_hash = ?)"
-            else:
-                table_check = "SELECT 1 FROM docs_embeddings_simple WHERE doc_id IN (SELECT id FROM docs WHERE content_hash = ?)"
-
-            cur.execute(table_check, (content_hash,))
-            if not cur.fetchone():
-                embedding = _get_embedding(f"{title}\n\n{content}")
-                if embedding:
-                    if HAS_VSS:
-                        # Use VSS format
-                        embedding_blob = sqlite_vss.serialize_float32(embedding)
-                        cur.execute("INSERT INTO docs_embeddings(doc_id, embedding) VALUES(?, ?)",
-                                   (doc_id, embedding_blob))
-                    else:
-                        # Use simple JSON format
-                        cur.execute("INSERT INTO docs_embeddings_simple(doc_id, embedding_json) VALUES(?, ?)",
-                                   (doc_id, json.dumps(embedding)))
-                    logger.info(f"💾 Created embedding for doc {doc_id}")
+            # The hash cache only dedups the API call: every doc still
+            # gets its own embedding row, otherwise a re-save of content
+            # seen before (cache entries outlive docs) would be
+            # invisible to semantic search.
+            # Single index-backed probe on the hash -> embedding cache table
+            # instead of a subquery joining through docs.
+            embedding = None
+            cur.execute("SELECT embedding FROM embedding_cache WHERE hash = ?", (content_hash,))
+            row = cur.fetchone()
+            if row:
+                try:
+                    embedding = json.loads(row[0])
+                except Exception:
+                    embedding = None
+            if embedding is None:
+                embedding = _get_embedding(f"{title}\n\n{content}", con)
+            if embedding:
+                if HAS_VSS:
+                    # Use VSS format
+                    embedding_blob = sqlite_vss.serialize_float32(embedding)
+                    cur.execute("INSERT INTO docs_embeddings(doc_id, embedding) VALUES(?, ?)",
+                               (doc_id, embedding_blob))
+                    # Virtual tables can't carry triggers, so keep the
+                    # stats counter in sync by hand on the VSS path
+                    cur.execute("""INSERT INTO stats(namespace, emb_count) VALUES(?, 1)
+                                   ON CONFLICT(namespace) DO UPDATE SET emb_count = emb_count + 1""",
+                               (namespace,))
+                else:
+                    # Use simple JSON format
+                    cur.execute("INSERT INTO docs_embeddings_simple(doc_id, embedding_json) VALUES(?, ?)",
+                               (doc_id, json.dumps(embedding)))
+                cur.execute("INSERT OR IGNORE INTO embedding_cache(hash, embedding) VALUES(?, ?)",
+                           (content_hash, json.dumps(embedding).encode("utf-8")))
+                logger.info(f"💾 Created embedding for doc {doc_id}")
         except Exception as e:
             logger.error(f"Failed to create embedding for doc {doc_id}: {e}")
 
@@ -222,7 +372,7 @@ def get_doc(doc_id: int) -> Dict[str,Any]:
         "namespace": r[1],
         "title": r[2],
         "content": r[3],
-        "meta": json.loads(r[4] or "{}"),
+        "meta": _loads_meta(r[4]),
         "created_at": r[5]
     }
 
@@ -236,7 +386,19 @@ def search_docs(query: str, namespace: Optional[str] = None, limit: int = 10) ->
     # Try semantic search first if available
     if HAS_OPENAI:
         try:
-            query_embedding = _get_embedding(query)
+            # Nothing to match against means the embedding API call is a
+            # guaranteed waste — check the stats counters before paying
+            # for it. Safe for legacy databases only because the schema
+            # migration seeds emb_count from existing embedding rows
+            if namespace:
+                cur.execute("SELECT emb_count FROM stats WHERE namespace = ?", (namespace,))
+                row = cur.fetchone()
+                has_embeddings = bool(row and row[0])
+            else:
+                cur.execute("SELECT COALESCE(SUM(emb_count), 0) FROM stats")
+                has_embeddings = bool(cur.fetchone()[0])
+
+            query_embedding = _get_embedding(query, con) if has_embeddings else None
             if query_embedding:
                 if HAS_VSS:
                     # Use VSS for fast vector search
@@ -269,7 +431,7 @@ def search_docs(query: str, namespace: Optional[str] = None, limit: int = 10) ->
                         "namespace": r[1],
                         "title": r[2],
                         "content": r[3],
-                        "meta": json.loads(r[4] or "{}"),
+                        "meta": _loads_meta(r[4]),
                         "created_at": r[5],
                         "similarity_score": 1.0 - r[6],  # Convert distance to similarity
                         "search_type": "semantic"
@@ -306,7 +468,7 @@ def search_docs(query: str, namespace: Optional[str] = None, limit: int = 10) ->
                         "namespace": r[0][1],
                         "title": r[0][2],
                         "content": r[0][3],
-                        "meta": json.loads(r[0][4] or "{}"),
+                        "meta": _loads_meta(r[0][4]),
                         "created_at": r[0][5],
                         "similarity_score": r[1],
                         "search_type": "semantic"
@@ -314,6 +476,8 @@ def search_docs(query: str, namespace: Optional[str] = None, limit: int = 10) ->
 
                 if results:
                     logger.info(f"🔍 Found {len(results)} semantic matches for: {query}")
+                    # Persist any embedding-cache write made for the query
+                    con.commit()
                     con.close()
                     return results
         except Exception as e:
@@ -340,6 +504,7 @@ def search_docs(query: str, namespace: Optional[str] = None, limit: int = 10) ->
         """, (search_terms, search_terms, limit))
 
     rows = cur.fetchall()
+    con.commit()
     con.close()
 
     results = [{
@@ -347,7 +512,7 @@ def search_docs(query: str, namespace: Optional[str] = None, limit: int = 10) ->
         "namespace": r[1],
         "title": r[2],
         "content": r[3],
-        "meta": json.loads(r[4] or "{}"),
+        "meta": _loads_meta(r[4]),
         "created_at": r[5],
         "search_type": "text"
     } for r in rows]
@@ -364,6 +529,19 @@ def delete_doc(doc_id: int) -> bool:
     if HAS_VSS:
         try:
             cur.execute("DELETE FROM docs_embeddings WHERE doc_id = ?", (doc_id,))
+            if cur.rowcount > 0:
+                # No triggers on virtual tables, so decrement stats directly
+                cur.execute("""UPDATE stats SET emb_count = emb_count - 1
+                               WHERE namespace = (SELECT namespace FROM docs WHERE id = ?)""",
+                           (doc_id,))
+        except Exception:
+            pass
+    else:
+        try:
+            # The FK cascade is inert without PRAGMA foreign_keys, so
+            # drop the rows explicitly (before the doc, while the delete
+            # trigger can still resolve the namespace for stats)
+            cur.execute("DELETE FROM docs_embeddings_simple WHERE doc_id = ?", (doc_id,))
         except Exception:
             pass
 
@@ -384,28 +562,15 @@ def get_stats() -> Dict[str, Any]:
     con = _conn()
     cur = con.cursor()
 
-    # Count docs by namespace
-    cur.execute("SELECT namespace, COUNT(*) FROM docs GROUP BY namespace")
-    namespace_counts = dict(cur.fetchall())
-
-    # Total docs
-    cur.execute("SELECT COUNT(*) FROM docs")
-    total_docs = cur.fetchone()[0]
-
-    # Count embeddings
-    embedding_count = 0
-    if HAS_OPENAI:
-        try:
-            if HAS_VSS:
-                cur.execute("SELECT COUNT(*) FROM docs_embeddings")
-            else:
-                cur.execute("SELECT COUNT(*) FROM docs_embeddings_simple")
-            embedding_count = cur.fetchone()[0]
-        except Exception:
-            pass
-
+    # Read the trigger-maintained counters instead of COUNT(*) scans
+    cur.execute("SELECT namespace, doc_count, emb_count FROM stats")
+    rows = cur.fetchall()
     con.close()
 
+    namespace_counts = {r[0]: r[1] for r in rows}
+    total_docs = sum(r[1] for r in rows)
+    embedding_count = sum(r[2] for r in rows)
+
     return {
         "total_docs": total_docs,
         "namespace_counts": namespace_counts,
@@ -414,6 +579,53 @@ def get_stats() -> Dict[str, Any]:
         "db_path": DB_PATH
     }
 
+_STATS_CACHE_PATH = os.path.expanduser("~/.cache/super_interpreter/stats.json")
+
+def _write_stats_cache() -> None:
+    """Query fresh stats and persist them for the next startup"""
+    try:
+        stats = get_stats()
+        os.makedirs(os.path.dirname(_STATS_CACHE_PATH), exist_ok=True)
+        tmp_path = _STATS_CACHE_PATH + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(stats, f)
+        # Atomic swap so a concurrent reader never sees a partial file
+        os.replace(tmp_path, _STATS_CACHE_PATH)
+    except Exception:
+        pass
+
+def get_stats_cached() -> Dict[str, Any]:
+    """Get memory statistics without blocking on the database.
+
+    Startup only needs stats for the banner, so serving the JSON
+    snapshot from the previous run keeps SQLite open/query latency off
+    the critical path. A daemon thread refreshes the snapshot in the
+    background; callers that need exact numbers should use get_stats().
+    """
+    cached = None
+    try:
+        with open(_STATS_CACHE_PATH) as f:
+            cached = json.load(f)
+    except Exception:
+        pass
+
+    if cached is not None:
+        import threading
+        threading.Thread(target=_write_stats_cache, daemon=True).start()
+        return cached
+
+    # First run (or unreadable cache): query directly and seed the cache
+    stats = get_stats()
+    try:
+        os.makedirs(os.path.dirname(_STATS_CACHE_PATH), exist_ok=True)
+        tmp_path = _STATS_CACHE_PATH + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(stats, f)
+        os.replace(tmp_path, _STATS_CACHE_PATH)
+    except Exception:
+        pass
+    return stats
+
 # Convenience functions for quick use
 def quick_save(namespace: str, content: str, title: Optional[str] = None) -> int:
     """Quick save with auto-generated title"""
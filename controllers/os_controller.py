@@ -1,4 +1,6 @@
-import subprocess, os
+import subprocess, os, threading
+from collections import deque
+from functools import lru_cache
 from pathlib import Path
 import yaml
 
@@ -8,15 +10,24 @@ class OSController:
         self.allowed_dirs = [Path(os.path.expandvars(p)).resolve()
                              for p in self.policy["system"]["allowed_dirs"]]
         self.allowed_editors = set(self.policy["system"]["allowed_editors"])
+        # Set lookup per ancestor is O(path depth) regardless of how many
+        # allowed_dirs the policy lists; same paths recur across shell/write
+        # calls so memoize the verdict too
+        self._allowed_set = {str(d) for d in self.allowed_dirs}
+        self._allowed_path_cached = lru_cache(maxsize=1024)(self._allowed_path_uncached)
 
     def _allowed_path(self, path: str) -> bool:
+        # A relative path resolves against the process cwd, so its verdict
+        # goes stale after os.chdir; only absolute paths are stable cache keys
+        if os.path.isabs(path):
+            return self._allowed_path_cached(path)
+        return self._allowed_path_uncached(path)
+
+    def _allowed_path_uncached(self, path: str) -> bool:
         p = Path(path).resolve()
-        for d in self.allowed_dirs:
-            try:
-                p.relative_to(d)
+        for parent in (p, *p.parents):
+            if str(parent) in self._allowed_set:
                 return True
-            except ValueError:
-                continue
         return False
 
     def run_shell(self, cmd: str, cwd: str = None, timeout: int = 60):
@@ -24,13 +35,33 @@ class OSController:
             print(f"[confirm] Run: {cmd} (cwd={cwd or os.getcwd()}) ? (y/N) ", end="")
             if input().strip().lower() != "y":
                 return {"ok": False, "error": "shell denied"}
-        r = subprocess.run(cmd, shell=True, cwd=cwd,
-                           capture_output=True, text=True, timeout=timeout)
+        # Stream output line by line into bounded deques so a chatty command
+        # never buffers its whole output in memory just to keep the tail
+        p = subprocess.Popen(["sh", "-c", cmd], cwd=cwd,
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        out, err = deque(maxlen=500), deque(maxlen=500)
+
+        def _drain(stream, buf):
+            for line in stream:
+                buf.append(line)
+
+        threads = [threading.Thread(target=_drain, args=(p.stdout, out), daemon=True),
+                   threading.Thread(target=_drain, args=(p.stderr, err), daemon=True)]
+        for t in threads:
+            t.start()
+        try:
+            p.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            p.kill()
+            p.wait()
+            raise
+        for t in threads:
+            t.join()
         return {
-            "ok": r.returncode == 0,
-            "code": r.returncode,
-            "stdout": r.stdout[-20000:],
-            "stderr": r.stderr[-20000:]
+            "ok": p.returncode == 0,
+            "code": p.returncode,
+            "stdout": "".join(out)[-20000:],
+            "stderr": "".join(err)[-20000:]
         }
 
     def open_in_editor(self, path: str, editor: str = "code"):
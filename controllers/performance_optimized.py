@@ -3,15 +3,93 @@ Performance optimizations for UI automation controllers.
 Prevents CPU busy-loops and enables efficient task queuing.
 """
 
+import ast
 import asyncio
+import logging
+import operator
+import os
 import threading
 import time
 import subprocess
-from queue import Queue, Empty
+from collections import deque
+from queue import Queue, Empty, Full
 from typing import Dict, Any, Optional, Callable
 from dataclasses import dataclass
 from concurrent.futures import ThreadPoolExecutor, Future
 
+logger = logging.getLogger(__name__)
+
+# Check if we have PyObjC for in-process Accessibility access
+HAS_PYOBJC = False
+try:
+    import ApplicationServices
+    import AppKit
+    HAS_PYOBJC = True
+except ImportError:
+    pass
+
+# Check if we have xxhash for fast frame signatures
+try:
+    import xxhash
+
+    def _hash_bytes(data: bytes) -> int:
+        return xxhash.xxh3_64_intdigest(data)
+except ImportError:
+    import hashlib
+
+    def _hash_bytes(data: bytes) -> int:
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+_ARITH_BIN_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+_ARITH_UNARY_OPS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+def _safe_eval_arithmetic(expression: str) -> float:
+    """Evaluate a pure-arithmetic expression via a whitelisted AST walk.
+
+    Raises ValueError for anything beyond numbers and basic operators, so
+    callers can fall back to driving Calculator for everything else.
+    """
+    def _eval(node):
+        if isinstance(node, ast.Expression):
+            return _eval(node.body)
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            return node.value
+        if isinstance(node, ast.BinOp) and type(node.op) in _ARITH_BIN_OPS:
+            return _ARITH_BIN_OPS[type(node.op)](_eval(node.left), _eval(node.right))
+        if isinstance(node, ast.UnaryOp) and type(node.op) in _ARITH_UNARY_OPS:
+            return _ARITH_UNARY_OPS[type(node.op)](_eval(node.operand))
+        raise ValueError(f"Unsupported expression node: {ast.dump(node)}")
+
+    return _eval(ast.parse(expression.replace("x", "*").replace("×", "*").replace("÷", "/"),
+                           mode="eval"))
+
+def _escape_script_string(text: str) -> str:
+    """Escape text for a double-quoted AppleScript/JXA string literal"""
+    return text.replace("\\", "\\\\").replace('"', '\\"')
+
+# Templated scripts compiled once with osacompile so osascript skips
+# parsing on every invocation; arguments arrive via `on run argv`
+_SCRIPT_TEMPLATES = {
+    "click": ('on run argv\n'
+              'tell application "System Events" to click at '
+              '{(item 1 of argv) as integer, (item 2 of argv) as integer}\n'
+              'end run\n'),
+    "type": ('on run argv\n'
+             'tell application "System Events" to keystroke (item 1 of argv)\n'
+             'end run\n'),
+}
+
 @dataclass
 class UITask:
     """Task for UI automation queue"""
@@ -20,14 +98,194 @@ class UITask:
     callback: Optional[Callable] = None
     result_queue: Optional[Queue] = None
 
+class RingQueue:
+    """Bounded MPSC ring buffer for the worker queues.
+
+    queue.Queue takes a lock plus condition wait on every put/get, which
+    becomes the bottleneck when click/type tasks arrive in bursts. Here
+    producers only hold a short lock to claim a slot, the single consumer
+    reads its own index without any lock, and semaphores provide blocking
+    wakeups for both sides. Power-of-two capacity makes index -> slot a
+    bitmask instead of a modulo.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        cap = 1
+        while cap < maxsize:
+            cap <<= 1
+        self._slots = [None] * cap
+        self._mask = cap - 1
+        self._head = 0  # next write index (producers, under _plock)
+        self._tail = 0  # next read index (consumer thread only)
+        self._plock = threading.Lock()
+        self._items = threading.Semaphore(0)
+        self._space = threading.Semaphore(cap)
+        self._unfinished = 0
+        self._all_done = threading.Event()
+        self._all_done.set()
+
+    def put(self, item, timeout: Optional[float] = None):
+        if not self._space.acquire(timeout=timeout):
+            raise Full
+        with self._plock:
+            self._slots[self._head & self._mask] = item
+            self._head += 1
+            self._unfinished += 1
+            self._all_done.clear()
+        self._items.release()
+
+    def get(self, timeout: Optional[float] = None):
+        if not self._items.acquire(timeout=timeout):
+            raise Empty
+        return self._take()
+
+    def get_nowait(self):
+        if not self._items.acquire(blocking=False):
+            raise Empty
+        return self._take()
+
+    def _take(self):
+        idx = self._tail & self._mask
+        item = self._slots[idx]
+        self._slots[idx] = None  # drop the reference promptly
+        self._tail += 1
+        self._space.release()
+        return item
+
+    def task_done(self):
+        with self._plock:
+            self._unfinished -= 1
+            if self._unfinished <= 0:
+                self._all_done.set()
+
+    def join(self):
+        self._all_done.wait()
+
+class OsaSession:
+    """Persistent osascript co-process (interactive mode).
+
+    Spawning osascript per call pays LaunchServices registration and
+    code-signing checks every time; keeping one interactive process alive
+    turns each script into a pipe write instead of a process spawn.
+    Scripts are sent line by line followed by a sentinel line whose echoed
+    result marks end-of-output. Restarts the process if it dies.
+    """
+
+    SENTINEL = "__OSA_END__"
+
+    def __init__(self, language: Optional[str] = None):
+        self.language = language  # None = AppleScript, "JavaScript" = JXA
+        self.lock = threading.Lock()
+        self.proc = None
+        self._out_q: Optional[Queue] = None
+
+    def _spawn(self):
+        cmd = ["osascript"]
+        if self.language:
+            cmd += ["-l", self.language]
+        cmd += ["-i", "-s", "s"]
+        self.proc = subprocess.Popen(
+            cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT, text=True, bufsize=1
+        )
+        # A pump thread owns the blocking reads so send() can enforce its
+        # deadline with queue waits; reading the pipe directly would hang
+        # past any timeout while osascript sits in a modal dialog or a
+        # long `delay`. One queue per spawn, so output from a killed
+        # process can never bleed into the next session.
+        q = Queue()
+        proc = self.proc
+
+        def _pump():
+            for line in proc.stdout:
+                q.put(line)
+            q.put(None)  # EOF: the process is gone
+
+        self._out_q = q
+        threading.Thread(target=_pump, daemon=True).start()
+
+    def send(self, script: str, timeout: float = 10) -> Dict[str, Any]:
+        """Run script lines in the co-process and return the output lines"""
+        with self.lock:
+            try:
+                if self.proc is None or self.proc.poll() is not None:
+                    self._spawn()
+
+                lines = [l for l in script.splitlines() if l.strip()]
+                # Sentinel is a bare string literal: its echoed result tells
+                # us every preceding line has finished executing
+                lines.append(f'"{self.SENTINEL}"')
+                self.proc.stdin.write("\n".join(lines) + "\n")
+                self.proc.stdin.flush()
+
+                output = []
+                deadline = time.time() + timeout
+                while True:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:  # hard timeout, even mid-line
+                        break
+                    try:
+                        line = self._out_q.get(timeout=remaining)
+                    except Empty:
+                        break
+                    if line is None:  # process died mid-read
+                        break
+                    if self.SENTINEL in line:
+                        return {"ok": True, "output": output}
+                    output.append(line.rstrip("\n"))
+
+                # Timed out or pipe closed - kill so next call respawns clean
+                self.proc.kill()
+                self.proc = None
+                return {"ok": False, "error": "osascript session timed out", "output": output}
+            except Exception as e:
+                try:
+                    if self.proc:
+                        self.proc.kill()
+                except Exception:
+                    pass
+                self.proc = None
+                return {"ok": False, "error": str(e)}
+
+    def close(self):
+        with self.lock:
+            if self.proc:
+                try:
+                    self.proc.stdin.close()
+                    self.proc.terminate()
+                except Exception:
+                    pass
+                self.proc = None
+
 class OptimizedUIController:
     """CPU-efficient UI controller with task queuing and smart waiting"""
 
     def __init__(self):
-        self.ui_queue = Queue(maxsize=128)
-        self.applescript_queue = Queue(maxsize=64)
+        self.ui_queue = RingQueue(maxsize=128)
+        self.applescript_queue = RingQueue(maxsize=64)
         self.is_running = True
 
+        # Long-lived osascript co-processes - one AppleScript, one JXA -
+        # so hot-path calls are pipe writes instead of process spawns
+        self.osa = OsaSession()
+        self.jxa = OsaSession("JavaScript")
+
+        # AXUIElement handles per app for the in-process element checks
+        self._ax_app_cache: Dict[str, Any] = {}
+
+        # Lazily osacompile'd script templates; "" marks a failed compile
+        self._compiled_scripts: Dict[str, str] = {}
+
+        # Set by shutdown() so any in-flight wait loop unblocks immediately
+        self._wait_cancel = threading.Event()
+
+        # Bounded error ring: deque.append is GIL-atomic, so workers record
+        # failures without taking a lock or blocking on stdout. A low-
+        # priority drainer batches entries out to the logger.
+        self.error_log = deque(maxlen=256)
+        self._error_drainer = threading.Thread(target=self._drain_errors, daemon=True)
+        self._error_drainer.start()
+
         # Start worker threads
         self.ui_worker = threading.Thread(target=self._ui_worker, daemon=True)
         self.applescript_worker = threading.Thread(target=self._applescript_worker, daemon=True)
@@ -35,8 +293,12 @@ class OptimizedUIController:
         self.ui_worker.start()
         self.applescript_worker.start()
 
-        # Thread pool for concurrent operations
-        self.executor = ThreadPoolExecutor(max_workers=4)
+        # Dedicated asyncio loop for concurrent dispatch: subprocess-bound
+        # work needs no Python compute, so one loop thread can hold many
+        # osascript invocations in flight where a thread pool capped at 4
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._loop_thread.start()
 
     def _ui_worker(self):
         """Worker thread for UI tasks - blocks instead of spinning"""
@@ -54,23 +316,91 @@ class OptimizedUIController:
             except Empty:
                 continue  # Timeout is normal, just continue
             except Exception as e:
-                print(f"UI worker error: {e}")
+                self._record_error("ui", e)
+
+    APPLESCRIPT_BATCH_MAX = 32
 
     def _applescript_worker(self):
         """Dedicated AppleScript worker to avoid subprocess spawn thrash"""
+        # EWMA of dispatch latency; used to pace retries only when the
+        # AppleScript engine is actually struggling, never on success
+        latency_ewma = 0.0
+
         while self.is_running:
             try:
                 script = self.applescript_queue.get(timeout=1.0)  # Block
-                subprocess.run(["osascript", "-e", script],
-                             check=False, capture_output=True)
-                self.applescript_queue.task_done()
-
-                # Small delay to prevent rapid-fire AppleScript calls
-                time.sleep(0.01)  # 10ms throttle
+                # Drain whatever else is already queued so one session
+                # round trip covers the whole burst
+                batch = [script]
+                while len(batch) < self.APPLESCRIPT_BATCH_MAX:
+                    try:
+                        batch.append(self.applescript_queue.get_nowait())
+                    except Empty:
+                        break
+
+                # The interactive session evaluates line by line, which
+                # breaks tell ... end tell blocks - only single-line
+                # scripts may share a session round trip; multi-line
+                # scripts each get a one-shot spawn
+                one_liners = [s for s in batch if "\n" not in s.strip()]
+                blocks = [s for s in batch if "\n" in s.strip()]
+
+                started = time.time()
+                result = {"ok": True}
+                if one_liners:
+                    result = self.osa.send("\n".join(one_liners))
+                for block in blocks:
+                    self._run_script_block(block)
+                elapsed = time.time() - started
+                latency_ewma = 0.8 * latency_ewma + 0.2 * elapsed
+
+                for _ in batch:
+                    self.applescript_queue.task_done()
+
+                # Back off only when the engine reports trouble - a failed
+                # round trip means it is saturated or restarting, so give
+                # it roughly one observed dispatch time before retrying
+                if not result["ok"]:
+                    self._wait_cancel.wait(min(max(latency_ewma, 0.01), 0.25))
             except Empty:
                 continue
             except Exception as e:
-                print(f"AppleScript worker error: {e}")
+                self._record_error("applescript", e)
+
+    def _run_script_block(self, script: str):
+        """One-shot osascript for a multi-line script; errors go to the log"""
+        try:
+            res = subprocess.run(["osascript", "-e", script],
+                                 capture_output=True, text=True, timeout=10)
+            if res.returncode != 0:
+                self._record_error(
+                    "applescript",
+                    RuntimeError(res.stderr.strip() or "osascript error"))
+        except Exception as e:
+            self._record_error("applescript", e)
+
+    def _record_error(self, worker: str, exc: Exception):
+        """Lock-free error capture for the worker hot path"""
+        self.error_log.append((time.time(), worker, repr(exc)))
+
+    def _drain_errors(self):
+        """Periodically flush the error ring to the logger in one batch"""
+        while self.is_running:
+            if self._wait_cancel.wait(1.0):
+                break
+            batch = []
+            while self.error_log:
+                try:
+                    batch.append(self.error_log.popleft())
+                except IndexError:
+                    break
+            if batch:
+                lines = "\n".join(f"  [{w}] {err}" for _, w, err in batch)
+                logger.error("%d worker error(s):\n%s", len(batch), lines)
+
+    def flush_applescript(self):
+        """Block until every queued AppleScript has executed"""
+        self.applescript_queue.join()
 
     def _execute_ui_task(self, task: UITask) -> Dict[str, Any]:
         """Execute a single UI task"""
@@ -88,59 +418,174 @@ class OptimizedUIController:
         except Exception as e:
             return {"ok": False, "error": str(e)}
 
+    def _compiled_script(self, name: str) -> str:
+        """Path to the osacompile'd template, or "" if compilation failed"""
+        path = self._compiled_scripts.get(name)
+        if path is not None:
+            return path
+
+        path = ""
+        try:
+            import tempfile
+            src = os.path.join(tempfile.gettempdir(), f"superi_{name}.applescript")
+            scpt = os.path.join(tempfile.gettempdir(), f"superi_{name}.scpt")
+            with open(src, "w") as f:
+                f.write(_SCRIPT_TEMPLATES[name])
+            # Output is never read - check=True surfaces failures, so skip
+            # the pipe allocation and reader threads capture_output sets up
+            subprocess.run(["osacompile", "-o", scpt, src], check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                           timeout=10)
+            path = scpt
+        except Exception:
+            path = ""
+        self._compiled_scripts[name] = path
+        return path
+
     def _direct_click(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Direct click without busy-waiting"""
-        x, y = payload["x"], payload["y"]
-        script = f"""
-        tell application "System Events"
-            click at {{{x}, {y}}}
-        end tell
-        """
+        x, y = int(payload["x"]), int(payload["y"])
 
-        try:
-            subprocess.run(["osascript", "-e", script], check=True, capture_output=True)
+        compiled = self._compiled_script("click")
+        if compiled:
+            script = f'run script POSIX file "{compiled}" with parameters {{{x}, {y}}}'
+        else:
+            script = f'tell application "System Events" to click at {{{x}, {y}}}'
+
+        result = self.osa.send(script)
+        if result["ok"]:
             return {"ok": True, "coordinates": [x, y]}
-        except subprocess.CalledProcessError as e:
-            return {"ok": False, "error": str(e)}
+        return {"ok": False, "error": result.get("error", "click failed")}
 
     def _direct_type(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Direct typing without delays"""
         text = payload["text"]
-        script = f'tell application "System Events" to keystroke "{text}"'
-
-        try:
-            subprocess.run(["osascript", "-e", script], check=True, capture_output=True)
+        escaped = _escape_script_string(text)
+
+        # The compiled template takes the text as an argv parameter, so the
+        # keystroke statement itself is never re-parsed around user input
+        compiled = self._compiled_script("type")
+        if compiled:
+            script = f'run script POSIX file "{compiled}" with parameters {{"{escaped}"}}'
+        else:
+            script = f'tell application "System Events" to keystroke "{escaped}"'
+
+        result = self.osa.send(script)
+        if result["ok"]:
             return {"ok": True, "text": text}
-        except subprocess.CalledProcessError as e:
-            return {"ok": False, "error": str(e)}
+        return {"ok": False, "error": result.get("error", "type failed")}
 
     def _smart_wait_element(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        """Smart waiting with exponential backoff - no busy-loop"""
+        """Event-driven element waiting with polling fallback"""
         app_name = payload["app_name"]
         role = payload["role"]
         title = payload["title"]
         timeout = payload.get("timeout", 10)
 
         start_time = time.time()
+
+        # Check once up front - the element may already be there
+        found = self._check_element_exists(app_name, role, title)
+        if found["ok"]:
+            return {"ok": True, "found": True, "wait_time": time.time() - start_time}
+
+        # Preferred path: block on AX notifications and only re-check the
+        # tree when the app actually reports new UI, instead of polling
+        if HAS_PYOBJC:
+            while time.time() - start_time < timeout:
+                remaining = timeout - (time.time() - start_time)
+                if not self._ax_wait_for_ui_change(app_name, remaining):
+                    break  # observer unavailable - fall through to polling
+                found = self._check_element_exists(app_name, role, title)
+                if found["ok"]:
+                    return {"ok": True, "found": True, "wait_time": time.time() - start_time}
+            else:
+                return {"ok": False, "error": f"Element not found within {timeout} seconds"}
+
+        # Fallback: exponential backoff polling
         wait_interval = 0.1  # Start with 100ms
         max_interval = 1.0   # Cap at 1 second
 
         while time.time() - start_time < timeout:
-            # Try to find element
             found = self._check_element_exists(app_name, role, title)
             if found["ok"]:
                 return {"ok": True, "found": True, "wait_time": time.time() - start_time}
 
-            # Exponential backoff to reduce CPU usage
-            time.sleep(wait_interval)
+            # Exponential backoff; Event.wait lets shutdown() cancel the
+            # wait instantly where a blind sleep could not be interrupted
+            if self._wait_cancel.wait(wait_interval):
+                return {"ok": False, "error": "Wait cancelled by shutdown"}
             wait_interval = min(wait_interval * 1.2, max_interval)
 
         return {"ok": False, "error": f"Element not found within {timeout} seconds"}
 
+    def _ax_wait_for_ui_change(self, app_name: str, timeout: float) -> bool:
+        """Block until app_name posts an AX created/changed notification.
+
+        Returns True if a notification fired within timeout, False when the
+        observer could not be set up (caller should fall back to polling).
+        """
+        if not HAS_PYOBJC or timeout <= 0:
+            return False
+
+        fired = threading.Event()
+        try:
+            from ApplicationServices import (
+                AXObserverCreate, AXObserverAddNotification,
+                AXObserverGetRunLoopSource, AXUIElementCreateApplication,
+                kAXCreatedNotification, kAXWindowCreatedNotification,
+                kAXFocusedUIElementChangedNotification)
+            from Quartz import (CFRunLoopAddSource, CFRunLoopGetCurrent,
+                                CFRunLoopRunInMode, kCFRunLoopDefaultMode)
+
+            pid = None
+            for app in AppKit.NSWorkspace.sharedWorkspace().runningApplications():
+                if app.localizedName() == app_name:
+                    pid = app.processIdentifier()
+                    break
+            if pid is None:
+                return False
+
+            def _on_notification(observer, element, notification, refcon):
+                fired.set()
+
+            err, observer = AXObserverCreate(pid, _on_notification, None)
+            if err != 0 or observer is None:
+                return False
+
+            app_element = AXUIElementCreateApplication(pid)
+            for note in (kAXCreatedNotification, kAXWindowCreatedNotification,
+                         kAXFocusedUIElementChangedNotification):
+                AXObserverAddNotification(observer, app_element, note, None)
+
+            def _pump_runloop():
+                CFRunLoopAddSource(CFRunLoopGetCurrent(),
+                                   AXObserverGetRunLoopSource(observer),
+                                   kCFRunLoopDefaultMode)
+                deadline = time.time() + timeout
+                while not fired.is_set() and time.time() < deadline:
+                    CFRunLoopRunInMode(kCFRunLoopDefaultMode, 0.25, True)
+
+            pump = threading.Thread(target=_pump_runloop, daemon=True)
+            pump.start()
+            fired.wait(timeout)
+            return fired.is_set()
+        except Exception:
+            return False
+
     def _check_element_exists(self, app_name: str, role: str, title: str) -> Dict[str, Any]:
         """Single element check without looping"""
+        # In-process AX walk avoids the JXA interpreter round trip entirely
+        if HAS_PYOBJC:
+            result = self._check_element_exists_ax(app_name, role, title)
+            if result is not None:
+                return result
+
+        app_name = _escape_script_string(app_name)
+        role = _escape_script_string(role)
+        title = _escape_script_string(title)
         jxa_script = f"""
-        function run() {{
+        (function() {{
             const se = Application("System Events");
             const p = se.processes["{app_name}"];
             if (!p.exists()) return JSON.stringify({{ok: false}});
@@ -169,25 +614,115 @@ class OptimizedUIController:
                 if (walk(w)) return JSON.stringify({{ok: true}});
             }}
             return JSON.stringify({{ok: false}});
-        }}
+        }})()
         """
 
         try:
-            result = subprocess.run(
-                ["osascript", "-l", "JavaScript", "-e", jxa_script],
-                capture_output=True, text=True, timeout=2
-            )
+            # Flatten to one line for the interactive JXA session so the
+            # IIFE executes (and its result echoes) as a single statement
+            one_liner = " ".join(l.strip() for l in jxa_script.splitlines() if l.strip())
+            result = self.jxa.send(one_liner, timeout=2)
+            if not result["ok"] or not result.get("output"):
+                return {"ok": False}
+            raw = result["output"][-1].strip()
+            # Interactive mode echoes the JS string quoted and escaped
+            if raw.startswith('"') and raw.endswith('"'):
+                raw = raw[1:-1].replace('\\"', '"').replace("\\\\", "\\")
             import json
-            return json.loads(result.stdout.strip())
+            return json.loads(raw)
         except:
             return {"ok": False}
 
+    def _check_element_exists_ax(self, app_name: str, role: str,
+                                 title: str) -> Optional[Dict[str, Any]]:
+        """In-process AX tree walk; returns None when PyObjC path is unusable"""
+        try:
+            from ApplicationServices import (
+                AXUIElementCreateApplication, AXUIElementCopyAttributeValue,
+                kAXChildrenAttribute, kAXRoleAttribute, kAXTitleAttribute,
+                kAXWindowsAttribute)
+
+            app_element = self._ax_app_cache.get(app_name)
+            if app_element is None:
+                pid = None
+                for app in AppKit.NSWorkspace.sharedWorkspace().runningApplications():
+                    if app.localizedName() == app_name:
+                        pid = app.processIdentifier()
+                        break
+                if pid is None:
+                    return {"ok": False}
+                app_element = AXUIElementCreateApplication(pid)
+                self._ax_app_cache[app_name] = app_element
+
+            # Case-fold the targets once, outside the walk
+            want_role = role.lower()
+            want_title = title.lower()
+
+            err, windows = AXUIElementCopyAttributeValue(
+                app_element, kAXWindowsAttribute, None)
+            if err != 0 or not windows:
+                return {"ok": False}
+
+            # Iterative DFS with an explicit stack, depth-capped like the
+            # JXA walk, early-exiting on the first match
+            stack = deque((w, 0) for w in windows)
+            while stack:
+                element, depth = stack.pop()
+                if depth > 8:
+                    continue
+                _, el_role = AXUIElementCopyAttributeValue(
+                    element, kAXRoleAttribute, None)
+                _, el_title = AXUIElementCopyAttributeValue(
+                    element, kAXTitleAttribute, None)
+
+                role_str = str(el_role).lower() if el_role else ""
+                if role_str.startswith("ax"):  # AXButton -> button
+                    role_str = role_str[2:]
+                title_str = str(el_title).lower() if el_title else ""
+
+                if role_str == want_role and want_title in title_str:
+                    return {"ok": True}
+
+                _, children = AXUIElementCopyAttributeValue(
+                    element, kAXChildrenAttribute, None)
+                if children:
+                    stack.extend((c, depth + 1) for c in children)
+
+            return {"ok": False}
+        except Exception:
+            # Stale cached element or missing permission - let the caller
+            # fall back to the JXA path and rebuild the cache next time
+            self._ax_app_cache.pop(app_name, None)
+            return None
+
     # Public API methods - these enqueue tasks instead of executing directly
 
+    async def _run_osascript_concurrent(self, script: str,
+                                        ok_payload: Dict[str, Any]) -> Dict[str, Any]:
+        """One-shot osascript dispatch on the asyncio loop.
+
+        The persistent session is serialized behind its lock, so truly
+        concurrent scripts need their own processes; the loop holds any
+        number of them in flight without a thread each.
+        """
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                "osascript", "-e", script,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE)
+            _, stderr = await proc.communicate()
+            if proc.returncode == 0:
+                return {"ok": True, **ok_payload}
+            return {"ok": False, "error": stderr.decode(errors="replace").strip()}
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
     def click_async(self, x: int, y: int) -> Future:
         """Async click - returns Future"""
-        task = UITask("click", {"x": x, "y": y})
-        return self.executor.submit(self._execute_ui_task, task)
+        script = f'tell application "System Events" to click at {{{int(x)}, {int(y)}}}'
+        return asyncio.run_coroutine_threadsafe(
+            self._run_osascript_concurrent(script, {"coordinates": [int(x), int(y)]}),
+            self._loop)
 
     def click_sync(self, x: int, y: int, timeout: float = 5.0) -> Dict[str, Any]:
         """Sync click with timeout"""
@@ -202,8 +737,10 @@ class OptimizedUIController:
 
     def type_async(self, text: str) -> Future:
         """Async typing"""
-        task = UITask("type", {"text": text})
-        return self.executor.submit(self._execute_ui_task, task)
+        script = (f'tell application "System Events" to keystroke '
+                  f'"{_escape_script_string(text)}"')
+        return asyncio.run_coroutine_threadsafe(
+            self._run_osascript_concurrent(script, {"text": text}), self._loop)
 
     def wait_for_element_efficient(self, app_name: str, role: str, title: str,
                                  timeout: int = 10) -> Dict[str, Any]:
@@ -220,29 +757,45 @@ class OptimizedUIController:
         """Queue AppleScript for batch execution"""
         self.applescript_queue.put(script)
 
-    def calculator_optimized(self, expression: str) -> Dict[str, Any]:
+    def calculator_optimized(self, expression: str, use_ui: bool = False) -> Dict[str, Any]:
         """Optimized Calculator automation - single AppleScript call"""
+        # Pure arithmetic doesn't need Calculator.app at all - evaluate it
+        # in-process and skip the activation dance entirely
+        if not use_ui:
+            try:
+                value = _safe_eval_arithmetic(expression)
+                return {"ok": True, "expression": expression,
+                        "result": value, "method": "python"}
+            except (ValueError, SyntaxError, ZeroDivisionError):
+                pass  # not plain arithmetic - drive the UI below
+
+        script = f'tell application "Calculator" to activate'
+        result = self.osa.send(script, timeout=5)
+        if not result["ok"]:
+            return {"ok": False, "error": result.get("error", "calculator activation failed")}
+
+        # Wait for Calculator to actually present its window instead of a
+        # hardcoded 300ms delay; fall back to the delay without PyObjC
+        if not self._ax_wait_for_ui_change("Calculator", 0.5):
+            self.osa.send("delay 0.3", timeout=5)
+
         script = f"""
-        tell application "Calculator" to activate
-        delay 0.3
-        tell application "System Events"
-            keystroke "c" using command down  -- Clear
-            delay 0.1
-            keystroke "{expression}"
-        end tell
+        tell application "System Events" to keystroke "c" using command down
+        delay 0.1
+        tell application "System Events" to keystroke "{_escape_script_string(expression)}"
         """
-
-        try:
-            subprocess.run(["osascript", "-e", script],
-                         check=True, capture_output=True, timeout=5)
-            return {"ok": True, "expression": expression}
-        except Exception as e:
-            return {"ok": False, "error": str(e)}
+        result = self.osa.send(script, timeout=5)
+        if result["ok"]:
+            return {"ok": True, "expression": expression, "method": "ui"}
+        return {"ok": False, "error": result.get("error", "calculator automation failed")}
 
     def shutdown(self):
         """Clean shutdown of workers"""
         self.is_running = False
-        self.executor.shutdown(wait=True)
+        self._wait_cancel.set()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self.osa.close()
+        self.jxa.close()
 
 # Drop-in replacements for existing controllers
 
@@ -256,13 +809,20 @@ class EfficientWaitMixin:
         wait_interval = 0.1  # Start with 100ms
         max_interval = 1.0   # Cap at 1 second
 
+        # Cancellable wait: another thread can set self._wait_cancel to
+        # unblock the loop immediately instead of riding out the sleep
+        cancel = getattr(self, "_wait_cancel", None)
+        if cancel is None:
+            cancel = self._wait_cancel = threading.Event()
+
         while time.time() - start_time < timeout:
             result = self.click_ui(role, title_substring)
             if result.get("ok"):
                 return {"ok": True, "found": True, "wait_time": time.time() - start_time}
 
             # Exponential backoff
-            time.sleep(wait_interval)
+            if cancel.wait(wait_interval):
+                return {"ok": False, "error": "Wait cancelled"}
             wait_interval = min(wait_interval * 1.2, max_interval)
 
         return {"ok": False, "error": f"Element not found within {timeout} seconds"}
@@ -270,42 +830,81 @@ class EfficientWaitMixin:
 class EfficientVisionMixin:
     """Mixin for efficient visual change detection"""
 
+    def _grab_signature(self) -> Optional[int]:
+        """Hash of a downsampled in-memory screen grab, or None if unavailable"""
+        if not HAS_PYOBJC:
+            return None
+        try:
+            import Quartz
+            image = Quartz.CGWindowListCreateImage(
+                Quartz.CGRectInfinite,
+                Quartz.kCGWindowListOptionOnScreenOnly,
+                Quartz.kCGNullWindowID,
+                Quartz.kCGWindowImageDefault)
+            if image is None:
+                return None
+            data = Quartz.CGDataProviderCopyData(Quartz.CGImageGetDataProvider(image))
+            if data is None:
+                return None
+            # Stride-sample every 64th byte (~every 16th pixel) - plenty to
+            # detect a change while hashing a fraction of the frame
+            return _hash_bytes(bytes(data)[::64])
+        except Exception:
+            return None
+
+    @staticmethod
+    def _file_signature(path: str) -> Optional[int]:
+        """Hash of a screenshot file's content"""
+        try:
+            with open(path, "rb") as f:
+                return _hash_bytes(f.read())
+        except OSError:
+            return None
+
     def wait_for_visual_change_efficient(self, reference_image: str = None,
                                        timeout: int = 10,
                                        poll_interval: float = 0.5) -> Dict[str, Any]:
         """Efficient visual change waiting with smart polling"""
-        if reference_image is None:
-            ref_screenshot = self.screenshot_full()
-            if not ref_screenshot["ok"]:
-                return {"ok": False, "error": "Failed to capture reference screenshot"}
-            reference_image = ref_screenshot["path"]
+        # Preferred path: hash downsampled pixels grabbed in memory - no
+        # screencapture spawn, no PNG encode, and deterministic (file-size
+        # proxies both false-positive on compression noise and miss
+        # same-size changes)
+        ref_sig = self._grab_signature() if reference_image is None else None
+        use_grab = ref_sig is not None
+
+        if not use_grab:
+            if reference_image is None:
+                ref_screenshot = self.screenshot_full()
+                if not ref_screenshot["ok"]:
+                    return {"ok": False, "error": "Failed to capture reference screenshot"}
+                reference_image = ref_screenshot["path"]
+            ref_sig = self._file_signature(reference_image)
 
         start_time = time.time()
         interval = poll_interval
         max_interval = 2.0  # Cap polling at 2 seconds
 
         while time.time() - start_time < timeout:
-            current_screenshot = self.screenshot_full()
-            if not current_screenshot["ok"]:
-                time.sleep(interval)
-                continue
-
-            # Simple file size comparison (fast proxy for content change)
-            try:
-                import os
-                ref_size = os.path.getsize(reference_image)
-                current_size = os.path.getsize(current_screenshot["path"])
-
-                # If sizes differ by more than 2%, assume change
-                if abs(ref_size - current_size) > ref_size * 0.02:
-                    return {
-                        "ok": True,
-                        "changed": True,
-                        "wait_time": time.time() - start_time,
-                        "current_screenshot": current_screenshot["path"]
-                    }
-            except OSError:
-                pass
+            if use_grab:
+                current_sig = self._grab_signature()
+                current_path = None
+            else:
+                current_screenshot = self.screenshot_full()
+                if not current_screenshot["ok"]:
+                    time.sleep(interval)
+                    continue
+                current_path = current_screenshot["path"]
+                current_sig = self._file_signature(current_path)
+
+            if current_sig is not None and current_sig != ref_sig:
+                result = {
+                    "ok": True,
+                    "changed": True,
+                    "wait_time": time.time() - start_time
+                }
+                if current_path:
+                    result["current_screenshot"] = current_path
+                return result
 
             # Adaptive polling - increase interval if no changes
             time.sleep(interval)
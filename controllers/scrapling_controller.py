@@ -8,15 +8,42 @@ warnings.filterwarnings("ignore")
 
 from scrapling.fetchers import Fetcher, StealthyFetcher, PlayWrightFetcher
 from typing import Dict, Any, List, Optional
+
+# Check if we have selectolax for C-level bounded text extraction
+try:
+    from selectolax.parser import HTMLParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
+
+import asyncio
+import threading
+import time
 import yaml
 import re
+
+# LibYAML's C parser when the wheel ships it; pure-Python loader otherwise
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+from collections import OrderedDict
 from pathlib import Path
+from queue import Queue
 
 class ScraplingController:
+    # Parsed policies keyed by path - re-instantiating the controller
+    # (e.g. one per worker) must not re-parse the same file
+    _policy_cache: Dict[str, Dict[str, Any]] = {}
+
     def __init__(self, policy_path: str = "policy.yaml"):
         """Initialize Scrapling controller with policy settings"""
         try:
-            self.policy = yaml.safe_load(Path(policy_path).read_text())
+            policy = self._policy_cache.get(policy_path)
+            if policy is None:
+                policy = yaml.load(Path(policy_path).read_text(), Loader=_YamlLoader)
+                type(self)._policy_cache[policy_path] = policy
+            self.policy = policy
             self.allowed = set(self.policy["browser"]["allowed_domains"])
         except Exception:
             # Fallback if policy file doesn't exist
@@ -26,10 +53,71 @@ class ScraplingController:
         # Enable adaptive mode for all fetchers
         StealthyFetcher.adaptive = True
 
+        # One anchored C-level regex match per check instead of stripping
+        # the scheme, splitting, and scanning the allowlist in Python
+        self._allowed_re = re.compile(
+            r"^(https?://)?([^/]*\.)?("
+            + "|".join(re.escape(d) for d in self.allowed)
+            + r")(:\d+)?(/|$)")
+
+        # Short-TTL LRU over fetch results so back-to-back operations on
+        # the same URL (the dominant pattern here) skip the network and
+        # browser startup entirely
+        self._fetch_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._fetch_cache_lock = threading.Lock()
+
+        # Warm pools of fetcher instances - constructing (and warming) a
+        # browser-backed fetcher per call is the most expensive part of
+        # fetch_stealth/fetch_dynamic, so reuse a small fixed set instead
+        self._stealth_pool = Queue()
+        self._pw_pool = Queue()
+        for _ in range(self.FETCHER_POOL_SIZE):
+            self._stealth_pool.put(StealthyFetcher())
+            self._pw_pool.put(PlayWrightFetcher())
+
+    FETCH_CACHE_TTL = 60     # seconds
+    FETCH_CACHE_MAX = 128
+    FETCHER_POOL_SIZE = 2
+
+    def _cache_get(self, key) -> Optional[Dict[str, Any]]:
+        with self._fetch_cache_lock:
+            hit = self._fetch_cache.get(key)
+            if hit and time.time() - hit[0] < self.FETCH_CACHE_TTL:
+                self._fetch_cache.move_to_end(key)
+                return hit[1]
+            if hit:
+                del self._fetch_cache[key]
+        return None
+
+    def _cache_put(self, key, result: Dict[str, Any]):
+        if not result.get("ok"):
+            return  # never cache failures
+        with self._fetch_cache_lock:
+            self._fetch_cache[key] = (time.time(), result)
+            self._fetch_cache.move_to_end(key)
+            while len(self._fetch_cache) > self.FETCH_CACHE_MAX:
+                self._fetch_cache.popitem(last=False)
+
+    @staticmethod
+    def _preview_text(page, limit: int = 1000) -> str:
+        """First `limit` chars of page text without flattening the whole DOM.
+
+        page.text materializes the entire document as one string just to be
+        sliced; parsing a bounded slice of the raw HTML keeps the cost
+        O(limit) instead of O(page size). 8x headroom covers the markup
+        surrounding the visible text.
+        """
+        if HAS_SELECTOLAX:
+            try:
+                html = page.html_content
+                return HTMLParser(html[:8 * limit]).text(deep=True)[:limit]
+            except Exception:
+                pass
+        return page.text[:limit]
+
     def _is_allowed(self, url: str) -> bool:
         """Check if URL domain is allowed by policy"""
-        domain = re.sub(r"^https?://", "", url).split("/")[0]
-        return any(domain.endswith(d) for d in self.allowed)
+        return bool(self._allowed_re.match(url))
 
     def fetch_basic(self, url: str) -> Dict[str, Any]:
         """Basic HTTP fetch using Scrapling's Fetcher"""
@@ -37,6 +125,10 @@ class ScraplingController:
             if not self._is_allowed(url):
                 return {"ok": False, "error": f"Domain not allowed: {url}"}
 
+            cached = self._cache_get(("basic", url))
+            if cached is not None:
+                return cached
+
             fetcher = Fetcher()
             page = fetcher.get(url)
 
@@ -44,14 +136,16 @@ class ScraplingController:
             title_element = page.css_first('title')
             title = title_element.text if title_element else "No title"
 
-            return {
+            result = {
                 "ok": True,
                 "status": page.status,
                 "title": title,
                 "url": page.url,
-                "content": page.text[:1000],  # First 1000 chars
+                "content": self._preview_text(page),  # First 1000 chars
                 "page": page  # Full page object for further operations
             }
+            self._cache_put(("basic", url), result)
+            return result
         except Exception as e:
             return {"ok": False, "error": str(e)}
 
@@ -61,48 +155,119 @@ class ScraplingController:
             if not self._is_allowed(url):
                 return {"ok": False, "error": f"Domain not allowed: {url}"}
 
-            fetcher = StealthyFetcher()
-            page = fetcher.get(url, headless=headless, network_idle=True)
+            cached = self._cache_get(("stealth", url, headless))
+            if cached is not None:
+                return cached
+
+            fetcher = self._stealth_pool.get()
+            try:
+                page = fetcher.get(url, headless=headless, network_idle=True)
+            finally:
+                self._stealth_pool.put(fetcher)
 
             # Extract title using CSS selector
             title_element = page.css_first('title')
             title = title_element.text if title_element else "No title"
 
-            return {
+            result = {
                 "ok": True,
                 "status": page.status,
                 "title": title,
                 "url": page.url,
-                "content": page.text[:1000],
+                "content": self._preview_text(page),
                 "page": page
             }
+            self._cache_put(("stealth", url, headless), result)
+            return result
         except Exception as e:
             return {"ok": False, "error": str(e)}
 
+    def prewarm(self) -> None:
+        """Spin up the stealth browser engine before the first real fetch.
+
+        The first StealthyFetcher.get launches the headless browser,
+        which dominates first-fetch latency. Fetching about:blank pays
+        that cost up front; meant to run on a background thread during
+        startup, so failures are swallowed.
+        """
+        try:
+            fetcher = self._stealth_pool.get()
+            try:
+                fetcher.get("about:blank", headless=True)
+            finally:
+                self._stealth_pool.put(fetcher)
+        except Exception:
+            pass
+
     def fetch_dynamic(self, url: str, headless: bool = True, wait_time: int = 3) -> Dict[str, Any]:
         """Dynamic fetch with full browser automation"""
         try:
             if not self._is_allowed(url):
                 return {"ok": False, "error": f"Domain not allowed: {url}"}
 
-            fetcher = PlayWrightFetcher()
-            page = fetcher.get(url, headless=headless, network_idle=True)
+            cached = self._cache_get(("dynamic", url, headless))
+            if cached is not None:
+                return cached
+
+            fetcher = self._pw_pool.get()
+            try:
+                page = fetcher.get(url, headless=headless, network_idle=True)
+            finally:
+                self._pw_pool.put(fetcher)
 
             # Extract title using CSS selector
             title_element = page.css_first('title')
             title = title_element.text if title_element else "No title"
 
-            return {
+            result = {
                 "ok": True,
                 "status": page.status,
                 "title": title,
                 "url": page.url,
-                "content": page.text[:1000],
+                "content": self._preview_text(page),
                 "page": page
             }
+            self._cache_put(("dynamic", url, headless), result)
+            return result
         except Exception as e:
             return {"ok": False, "error": str(e)}
 
+    @staticmethod
+    def _extract_selectors(page, css_selectors: List[str], adaptive: bool = True) -> Dict[str, Any]:
+        """Run each selector against an already-fetched page.
+
+        Adaptive queries must stay one-per-selector (Scrapling's healing is
+        keyed on the individual selector), but plain queries can share a
+        single C-level parse of the document instead of N tree walks
+        through Scrapling's matching layer.
+        """
+        if not adaptive and HAS_SELECTOLAX:
+            try:
+                tree = HTMLParser(page.html_content)
+                results = {}
+                for selector in css_selectors:
+                    try:
+                        texts = [n.text(deep=True).strip() for n in tree.css(selector)]
+                        results[selector] = [t for t in texts if t]
+                    except Exception as e:
+                        results[selector] = {"error": str(e)}
+                return results
+            except Exception:
+                pass  # fall back to Scrapling's own matcher
+
+        results = {}
+        for selector in css_selectors:
+            try:
+                # Use adaptive mode to handle website changes
+                elements = page.css(selector, adaptive=adaptive)
+                if elements:
+                    results[selector] = [elem.text.strip() for elem in elements if elem.text.strip()]
+                else:
+                    results[selector] = []
+            except Exception as e:
+                results[selector] = {"error": str(e)}
+        return results
+
     def scrape_elements(self, url: str, css_selectors: List[str], adaptive: bool = True) -> Dict[str, Any]:
         """Scrape specific elements with adaptive capability"""
         try:
@@ -112,18 +277,7 @@ class ScraplingController:
                 return page_result
 
             page = page_result["page"]
-            results = {}
-
-            for selector in css_selectors:
-                try:
-                    # Use adaptive mode to handle website changes
-                    elements = page.css(selector, adaptive=adaptive)
-                    if elements:
-                        results[selector] = [elem.text.strip() for elem in elements if elem.text.strip()]
-                    else:
-                        results[selector] = []
-                except Exception as e:
-                    results[selector] = {"error": str(e)}
+            results = self._extract_selectors(page, css_selectors, adaptive)
 
             # Extract title using CSS selector
             title_element = page.css_first('title')
@@ -138,8 +292,40 @@ class ScraplingController:
         except Exception as e:
             return {"ok": False, "error": str(e)}
 
-    def scrape_trending_news(self) -> Dict[str, Any]:
-        """Scrape trending news from multiple sources"""
+    async def fetch_basic_async(self, url: str) -> Dict[str, Any]:
+        """Async wrapper around fetch_basic for concurrent scraping"""
+        return await asyncio.to_thread(self.fetch_basic, url)
+
+    async def fetch_stealth_async(self, url: str, headless: bool = True) -> Dict[str, Any]:
+        """Async wrapper around fetch_stealth for concurrent scraping"""
+        return await asyncio.to_thread(self.fetch_stealth, url, headless)
+
+    async def fetch_dynamic_async(self, url: str, headless: bool = True,
+                                  wait_time: int = 3) -> Dict[str, Any]:
+        """Async wrapper around fetch_dynamic for concurrent scraping"""
+        return await asyncio.to_thread(self.fetch_dynamic, url, headless, wait_time)
+
+    async def _scrape_source_async(self, source: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch and extract one news source (runs concurrently with others)"""
+        try:
+            if source.get("type") == "json":
+                # Handle JSON APIs
+                page_result = await self.fetch_basic_async(source["url"])
+                if page_result["ok"]:
+                    return {"status": "success", "content": "JSON data retrieved"}
+                return {"error": page_result.get("error", "fetch failed")}
+            else:
+                # Handle HTML scraping
+                scrape_result = await asyncio.to_thread(
+                    self.scrape_elements, source["url"], source["selectors"])
+                if scrape_result["ok"]:
+                    return scrape_result["results"]
+                return {"error": scrape_result["error"]}
+        except Exception as e:
+            return {"error": str(e)}
+
+    async def scrape_trending_news_async(self) -> Dict[str, Any]:
+        """Scrape trending news from multiple sources concurrently"""
         try:
             news_sources = [
                 {
@@ -154,27 +340,18 @@ class ScraplingController:
                 }
             ]
 
-            results = {}
+            # Each source is a full network round trip, so fetch them all at
+            # once - wall time becomes the slowest source, not the sum
+            gathered = await asyncio.gather(
+                *(self._scrape_source_async(s) for s in news_sources),
+                return_exceptions=True)
 
-            for source in news_sources:
-                try:
-                    if source.get("type") == "json":
-                        # Handle JSON APIs
-                        page_result = self.fetch_basic(source["url"])
-                        if page_result["ok"]:
-                            results[source["name"]] = {
-                                "status": "success",
-                                "content": "JSON data retrieved"
-                            }
-                    else:
-                        # Handle HTML scraping
-                        scrape_result = self.scrape_elements(source["url"], source["selectors"])
-                        if scrape_result["ok"]:
-                            results[source["name"]] = scrape_result["results"]
-                        else:
-                            results[source["name"]] = {"error": scrape_result["error"]}
-                except Exception as e:
-                    results[source["name"]] = {"error": str(e)}
+            results = {}
+            for source, outcome in zip(news_sources, gathered):
+                if isinstance(outcome, Exception):
+                    results[source["name"]] = {"error": str(outcome)}
+                else:
+                    results[source["name"]] = outcome
 
             return {
                 "ok": True,
@@ -184,6 +361,30 @@ class ScraplingController:
         except Exception as e:
             return {"ok": False, "error": str(e)}
 
+    # Shared loop for the sync shims: asyncio.run builds and tears down
+    # an event loop (plus its selector and self-pipe) per call, so keep
+    # one loop alive on a daemon thread and post coroutines to it
+    _shim_loop: Optional[asyncio.AbstractEventLoop] = None
+    _shim_loop_lock = threading.Lock()
+
+    @classmethod
+    def _get_shim_loop(cls) -> asyncio.AbstractEventLoop:
+        if cls._shim_loop is None:
+            with cls._shim_loop_lock:
+                if cls._shim_loop is None:
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(target=loop.run_forever, daemon=True).start()
+                    cls._shim_loop = loop
+        return cls._shim_loop
+
+    def scrape_trending_news(self) -> Dict[str, Any]:
+        """Sync shim over scrape_trending_news_async for existing callers"""
+        try:
+            return asyncio.run_coroutine_threadsafe(
+                self.scrape_trending_news_async(), self._get_shim_loop()).result()
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
     def _summarize_trending(self, results: Dict) -> str:
         """Create a summary of trending topics"""
         trends = []
@@ -236,23 +437,32 @@ class ScraplingController:
     def adaptive_scrape(self, url: str, selectors: List[str], fallback_selectors: List[str] = None) -> Dict[str, Any]:
         """Advanced adaptive scraping with fallback selectors"""
         try:
-            # First attempt with primary selectors
-            result = self.scrape_elements(url, selectors, adaptive=True)
+            # Fetch the page once and reuse it for primary and fallback
+            # selector sets - no second browser round trip
+            page_result = self.fetch_stealth(url)
+            if not page_result["ok"]:
+                return page_result
+
+            page = page_result["page"]
+            title_element = page.css_first('title')
+            title = title_element.text if title_element else "No title"
 
-            if result["ok"] and any(result["results"].values()):
+            results = self._extract_selectors(page, selectors, adaptive=True)
+            result = {"ok": True, "url": url, "title": title, "results": results}
+
+            if any(results.values()):
                 return result
 
             # If no results and fallback selectors provided, try them
             if fallback_selectors:
-                fallback_result = self.scrape_elements(url, fallback_selectors, adaptive=True)
-                if fallback_result["ok"]:
-                    return {
-                        "ok": True,
-                        "url": url,
-                        "title": fallback_result["title"],
-                        "results": fallback_result["results"],
-                        "fallback_used": True
-                    }
+                fallback_results = self._extract_selectors(page, fallback_selectors, adaptive=True)
+                return {
+                    "ok": True,
+                    "url": url,
+                    "title": title,
+                    "results": fallback_results,
+                    "fallback_used": True
+                }
 
             return result
         except Exception as e:
@@ -264,7 +474,7 @@ class ScraplingController:
             page_result = self.fetch_stealth(url)
             if page_result["ok"]:
                 page = page_result["page"]
-                text = page.text[:max_length]
+                text = self._preview_text(page, max_length)
                 # Extract title using CSS selector
                 title_element = page.css_first('title')
                 title = title_element.text if title_element else "No title"
@@ -1,41 +1,319 @@
 import json
 import subprocess
+import threading
 import time
+from collections import deque
+from pathlib import Path
 from typing import List, Optional, Dict, Any, Tuple
 
+from controllers.performance_optimized import _escape_script_string
+
+# C-accelerated JSON when available: every JXA round trip parses a result
+# and serializes its args
+try:
+    import orjson
+
+    def _loads(s):
+        return orjson.loads(s)
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj) -> str:
+        return json.dumps(obj)
+
+# Consolidated JXA ops live in one dispatcher script so they are parsed
+# once (by the resident session, or ahead of time by osacompile) instead
+# of on every call
+_DISPATCHER_JS = Path(__file__).with_name("_jxa_dispatcher.js")
+_DISPATCHER_SCPT = Path.home() / ".cache" / "super_interpreter" / "ui.scpt"
+
+# Optional PyObjC path: posting CGEvents straight to WindowServer skips
+# osascript entirely for synthetic mouse input
+try:
+    from Quartz import (
+        CGEventCreateMouseEvent, CGEventPost, CGEventSetIntegerValueField,
+        kCGEventLeftMouseDown, kCGEventLeftMouseUp, kCGEventLeftMouseDragged,
+        kCGEventRightMouseDown, kCGEventRightMouseUp,
+        kCGHIDEventTap, kCGMouseButtonLeft, kCGMouseButtonRight,
+        kCGMouseEventClickState,
+        CGEventCreateKeyboardEvent, CGEventKeyboardSetUnicodeString,
+        CGEventSetFlags, kCGEventFlagMaskCommand, kCGEventFlagMaskShift,
+        kCGEventFlagMaskAlternate, kCGEventFlagMaskControl,
+        CGMainDisplayID, CGDisplayBounds)
+    from AppKit import NSEvent
+    HAS_QUARTZ = True
+except ImportError:
+    HAS_QUARTZ = False
+
+# Virtual key codes for the named keys callers pass to keystroke();
+# anything else is sent as a unicode-string event and needs no code
+_KEY_CODES = {
+    "return": 36, "enter": 36, "tab": 48, "space": 49, "delete": 51,
+    "escape": 53, "esc": 53, "left": 123, "right": 124, "down": 125, "up": 126,
+}
+
+# Modifier handling is a hot path under keystroke streams, so the string
+# building happens once at import: every subset of {cmd, shift, opt, ctrl}
+# maps straight to its final AppleScript fragment (and, with Quartz, its
+# CGEventFlags mask) - one dict probe per call, no branches or rstrip
+_MOD_NORMALIZE = {"command": "cmd", "cmd": "cmd", "shift": "shift",
+                  "option": "opt", "alt": "opt", "control": "ctrl",
+                  "ctrl": "ctrl"}
+_MOD_ORDER = ("cmd", "shift", "opt", "ctrl")
+_MOD_AS_NAMES = {"cmd": "command down", "shift": "shift down",
+                 "opt": "option down", "ctrl": "control down"}
+_MOD_TABLE = {}
+for _bits in range(16):
+    _subset = frozenset(m for _i, m in enumerate(_MOD_ORDER) if _bits >> _i & 1)
+    _MOD_TABLE[_subset] = ", ".join(
+        _MOD_AS_NAMES[m] for m in _MOD_ORDER if m in _subset)
+
+if HAS_QUARTZ:
+    _MOD_FLAG_BITS = {"cmd": kCGEventFlagMaskCommand,
+                      "shift": kCGEventFlagMaskShift,
+                      "opt": kCGEventFlagMaskAlternate,
+                      "ctrl": kCGEventFlagMaskControl}
+    _MOD_FLAGS = {}
+    for _subset in _MOD_TABLE:
+        _mask = 0
+        for _m in _subset:
+            _mask |= _MOD_FLAG_BITS[_m]
+        _MOD_FLAGS[_subset] = _mask
+
+def _mod_key(mods: List[str]) -> frozenset:
+    return frozenset(_MOD_NORMALIZE[m] for m in mods if m in _MOD_NORMALIZE)
+
+def _keystroke_script(key: str, mod_string: str) -> str:
+    """AppleScript for one key press, routing named keys through key code.
+
+    keystroke "space" types the five letters - named keys must be sent
+    as `key code N` or a Cmd+Space becomes Cmd+S, Cmd+P, ...
+    """
+    code = _KEY_CODES.get(key.lower())
+    action = f'key code {code}' if code is not None else f'keystroke "{key}"'
+    if mod_string:
+        action += f' using {{{mod_string}}}'
+    return f'tell application "System Events" to {action}'
+
+class _AXTreeCache:
+    """Per-process snapshot of AX (title, value, element) rows.
+
+    Walking an AX tree costs one IPC per level; repeated text searches
+    against the same app re-pay that every time. Snapshots are kept in
+    RAM and invalidated by AXObserver notifications (window created or
+    destroyed, focus change, app activated), so a query against an
+    unchanged app is a pure in-process scan.
+    """
+
+    NOTIFICATIONS = ("AXWindowCreated", "AXUIElementDestroyed",
+                     "AXFocusedWindowChanged", "AXApplicationActivated")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshots = {}  # pid -> list of (title, value, ax element)
+        self._dirty = set()
+        self._observers = {}  # pid -> observer; keeps the callback alive
+
+    def get(self, pid, build):
+        """Snapshot for pid, rebuilt via build(pid) when absent or dirty"""
+        with self._lock:
+            if pid in self._snapshots and pid not in self._dirty:
+                return self._snapshots[pid]
+        rows = build(pid)
+        with self._lock:
+            self._snapshots[pid] = rows
+            self._dirty.discard(pid)
+        self._watch(pid)
+        return rows
+
+    def invalidate(self, pid):
+        with self._lock:
+            self._dirty.add(pid)
+
+    def _watch(self, pid):
+        """Register for change notifications; best-effort"""
+        if pid in self._observers:
+            return
+        try:
+            from ApplicationServices import (
+                AXObserverCreate, AXObserverAddNotification,
+                AXObserverGetRunLoopSource, AXUIElementCreateApplication)
+            from Quartz import (CFRunLoopAddSource, CFRunLoopGetCurrent,
+                                CFRunLoopRunInMode, kCFRunLoopDefaultMode)
+
+            def _changed(observer, element, notification, refcon):
+                self.invalidate(pid)
+
+            err, observer = AXObserverCreate(pid, _changed, None)
+            if err != 0:
+                return
+            app_element = AXUIElementCreateApplication(pid)
+            for note in self.NOTIFICATIONS:
+                AXObserverAddNotification(observer, app_element, note, None)
+
+            # The observer only fires on a pumped run loop; give it a
+            # dedicated daemon thread so no caller ever blocks on it
+            def _pump():
+                CFRunLoopAddSource(CFRunLoopGetCurrent(),
+                                   AXObserverGetRunLoopSource(observer),
+                                   kCFRunLoopDefaultMode)
+                while True:
+                    CFRunLoopRunInMode(kCFRunLoopDefaultMode, 60.0, False)
+
+            threading.Thread(target=_pump, daemon=True).start()
+            self._observers[pid] = observer
+        except Exception:
+            # Without notifications a cached snapshot could go stale
+            # silently - mark it dirty so every query rebuilds instead
+            self.invalidate(pid)
+
 class SystemUIController:
     """Universal macOS UI automation for laptop-wide control via Accessibility APIs"""
 
     def __init__(self):
         self.default_delay = 0.1
+        # Persistent interactive osascript co-processes (one AppleScript,
+        # one JXA) so every call is a pipe round-trip instead of paying the
+        # spawn + compile tax of a fresh osascript process. Falls back to
+        # per-call spawns if the sessions cannot be created.
+        try:
+            from controllers.performance_optimized import OsaSession
+            self._osa = OsaSession()
+            self._jxa = OsaSession(language="JavaScript")
+        except Exception:
+            self._osa = None
+            self._jxa = None
+        self._dispatcher_loaded = False
+        self._scpt_path = None  # lazily compiled; "" once compilation fails
+        self._screen_size = None
+        self._ax_cache = _AXTreeCache()
+        self._dock_items = None  # (title, element) rows; rebuilt when stale
 
     def _run_applescript(self, script: str) -> str:
         """Execute AppleScript and return output"""
+        if self._osa is not None:
+            result = self._osa.send(script)
+            if result["ok"]:
+                output = result.get("output", [])
+                # Interactive mode reports errors inline rather than via
+                # the exit code, so surface them the same way a spawn would
+                err = next((l for l in output if "error:" in l), None)
+                if err:
+                    raise RuntimeError(f"AppleScript error: {err.strip()}")
+                return "\n".join(output).strip()
+            # Session died or timed out - fall back to a one-shot spawn
         cmd = ["osascript", "-e", script]
         result = subprocess.run(cmd, capture_output=True, text=True)
         if result.returncode != 0:
             raise RuntimeError(f"AppleScript error: {result.stderr.strip()}")
         return result.stdout.strip()
 
+    @staticmethod
+    def _unquote_echo(raw: str) -> str:
+        """Undo the quoting the interactive session applies to JS strings"""
+        raw = raw.strip()
+        if raw.startswith('"') and raw.endswith('"'):
+            raw = raw[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+        return raw
+
     def _run_jxa(self, script: str, *args: str) -> str:
         """Execute JXA JavaScript and return output"""
+        if self._jxa is not None:
+            # The interactive session is line-oriented: flatten the script
+            # and invoke run() explicitly with the args inlined, since the
+            # REPL does not call run(argv) the way `osascript -e` does
+            one_liner = " ".join(l.strip() for l in script.splitlines() if l.strip())
+            one_liner += f"; run({_dumps(list(args))})"
+            result = self._jxa.send(one_liner)
+            if result["ok"] and result.get("output"):
+                return self._unquote_echo(result["output"][-1])
+            # Session died or timed out - fall back to a one-shot spawn
         cmd = ["osascript", "-l", "JavaScript", "-e", script, "--"] + list(args)
         result = subprocess.run(cmd, capture_output=True, text=True)
         if result.returncode != 0:
             raise RuntimeError(f"JXA error: {result.stderr.strip()}")
         return result.stdout.strip()
 
+    def _compiled_dispatcher(self) -> str:
+        """Compile the dispatcher to .scpt once; returns its path, or an
+        empty string when osacompile is unavailable or fails"""
+        if self._scpt_path is None:
+            try:
+                if (not _DISPATCHER_SCPT.exists()
+                        or _DISPATCHER_SCPT.stat().st_mtime < _DISPATCHER_JS.stat().st_mtime):
+                    _DISPATCHER_SCPT.parent.mkdir(parents=True, exist_ok=True)
+                    subprocess.run(
+                        ["osacompile", "-l", "JavaScript",
+                         "-o", str(_DISPATCHER_SCPT), str(_DISPATCHER_JS)],
+                        check=True, capture_output=True, timeout=10)
+                self._scpt_path = str(_DISPATCHER_SCPT)
+            except Exception:
+                self._scpt_path = ""
+        return self._scpt_path
+
+    def _jxa_op(self, op: str, *args: str) -> Dict[str, Any]:
+        """Run a named dispatcher op and decode its JSON result.
+
+        Prefers the resident session, where the dispatcher is parsed once
+        and each call is a one-line dispatch(); falls back to spawning
+        osascript on the precompiled .scpt, which skips the compiler
+        frontend even when a fresh process is unavoidable.
+        """
+        if self._jxa is not None:
+            if not self._dispatcher_loaded:
+                src = _DISPATCHER_JS.read_text()
+                flat = " ".join(l.strip() for l in src.splitlines()
+                                if l.strip() and not l.strip().startswith(("/*", "*", "*/")))
+                if self._jxa.send(flat)["ok"]:
+                    self._dispatcher_loaded = True
+            if self._dispatcher_loaded:
+                call = f"dispatch({_dumps(op)}, {_dumps(list(args))})"
+                result = self._jxa.send(call)
+                if result["ok"] and result.get("output"):
+                    return _loads(self._unquote_echo(result["output"][-1]))
+                # Session respawned - its parsed state is gone
+                self._dispatcher_loaded = False
+        scpt = self._compiled_dispatcher()
+        if scpt:
+            r = subprocess.run(["osascript", scpt, op] + list(args),
+                               capture_output=True, text=True)
+            if r.returncode == 0:
+                return _loads(r.stdout.strip())
+            raise RuntimeError(f"JXA error: {r.stderr.strip()}")
+        raise RuntimeError("JXA dispatcher unavailable")
+
     # ========== COORDINATE-BASED CLICKING ==========
 
+    @staticmethod
+    def _cg_click(x: int, y: int, button: int = 0, clicks: int = 1):
+        """Post a down/up CGEvent pair straight to WindowServer"""
+        if button == kCGMouseButtonRight:
+            pair = (kCGEventRightMouseDown, kCGEventRightMouseUp)
+        else:
+            pair = (kCGEventLeftMouseDown, kCGEventLeftMouseUp)
+        for n in range(1, clicks + 1):
+            for event_type in pair:
+                ev = CGEventCreateMouseEvent(None, event_type, (x, y), button)
+                # Click state distinguishes single from double clicks
+                CGEventSetIntegerValueField(ev, kCGMouseEventClickState, n)
+                CGEventPost(kCGHIDEventTap, ev)
+            time.sleep(0.01)
+
     def click_anywhere(self, x: int, y: int) -> Dict[str, Any]:
         """Click at absolute screen coordinates"""
+        if HAS_QUARTZ:
+            try:
+                self._cg_click(x, y, kCGMouseButtonLeft)
+                return {"ok": True, "action": "click", "coordinates": [x, y]}
+            except Exception:
+                pass  # fall back to AppleScript
         try:
-            script = f"""
-            tell application "System Events"
-                set mouseLocation to {{{x}, {y}}}
-                click at mouseLocation
-            end tell
-            """
+            # One complete statement per line so the script runs unchanged
+            # in the interactive session and the spawn fallback
+            script = f'tell application "System Events" to click at {{{x}, {y}}}'
             self._run_applescript(script)
             return {"ok": True, "action": "click", "coordinates": [x, y]}
         except Exception as e:
@@ -43,15 +321,18 @@ class SystemUIController:
 
     def double_click_anywhere(self, x: int, y: int) -> Dict[str, Any]:
         """Double-click at absolute screen coordinates"""
+        if HAS_QUARTZ:
+            try:
+                self._cg_click(x, y, kCGMouseButtonLeft, clicks=2)
+                return {"ok": True, "action": "double_click", "coordinates": [x, y]}
+            except Exception:
+                pass
         try:
-            script = f"""
-            tell application "System Events"
-                set mouseLocation to {{{x}, {y}}}
-                click at mouseLocation
-                delay 0.1
-                click at mouseLocation
-            end tell
-            """
+            script = (
+                f'tell application "System Events" to click at {{{x}, {y}}}\n'
+                'delay 0.1\n'
+                f'tell application "System Events" to click at {{{x}, {y}}}'
+            )
             self._run_applescript(script)
             return {"ok": True, "action": "double_click", "coordinates": [x, y]}
         except Exception as e:
@@ -59,13 +340,14 @@ class SystemUIController:
 
     def right_click_anywhere(self, x: int, y: int) -> Dict[str, Any]:
         """Right-click at absolute screen coordinates"""
+        if HAS_QUARTZ:
+            try:
+                self._cg_click(x, y, kCGMouseButtonRight)
+                return {"ok": True, "action": "right_click", "coordinates": [x, y]}
+            except Exception:
+                pass
         try:
-            script = f"""
-            tell application "System Events"
-                set mouseLocation to {{{x}, {y}}}
-                right click at mouseLocation
-            end tell
-            """
+            script = f'tell application "System Events" to right click at {{{x}, {y}}}'
             self._run_applescript(script)
             return {"ok": True, "action": "right_click", "coordinates": [x, y]}
         except Exception as e:
@@ -73,22 +355,36 @@ class SystemUIController:
 
     def drag(self, from_x: int, from_y: int, to_x: int, to_y: int) -> Dict[str, Any]:
         """Drag from one coordinate to another"""
+        if HAS_QUARTZ:
+            try:
+                # A real drag: button down, interpolated dragged events so
+                # the target app sees continuous motion, then button up
+                down = CGEventCreateMouseEvent(
+                    None, kCGEventLeftMouseDown, (from_x, from_y), kCGMouseButtonLeft)
+                CGEventPost(kCGHIDEventTap, down)
+                steps = min(max(abs(to_x - from_x), abs(to_y - from_y)) // 20, 20) or 1
+                for i in range(1, steps + 1):
+                    mx = from_x + (to_x - from_x) * i / steps
+                    my = from_y + (to_y - from_y) * i / steps
+                    move = CGEventCreateMouseEvent(
+                        None, kCGEventLeftMouseDragged, (mx, my), kCGMouseButtonLeft)
+                    CGEventPost(kCGHIDEventTap, move)
+                    time.sleep(0.005)
+                up = CGEventCreateMouseEvent(
+                    None, kCGEventLeftMouseUp, (to_x, to_y), kCGMouseButtonLeft)
+                CGEventPost(kCGHIDEventTap, up)
+                return {"ok": True, "action": "drag",
+                        "from": [from_x, from_y], "to": [to_x, to_y]}
+            except Exception:
+                pass
         try:
-            script = f"""
-            tell application "System Events"
-                set startPoint to {{{from_x}, {from_y}}}
-                set endPoint to {{{to_x}, {to_y}}}
-
-                -- Click and hold at start point
-                click at startPoint
-                delay 0.1
-
-                -- Drag to end point
-                key down option
-                click at endPoint
-                key up option
-            end tell
-            """
+            script = (
+                f'tell application "System Events" to click at {{{from_x}, {from_y}}}\n'
+                'delay 0.1\n'
+                'tell application "System Events" to key down option\n'
+                f'tell application "System Events" to click at {{{to_x}, {to_y}}}\n'
+                'tell application "System Events" to key up option'
+            )
             self._run_applescript(script)
             return {"ok": True, "action": "drag", "from": [from_x, from_y], "to": [to_x, to_y]}
         except Exception as e:
@@ -109,58 +405,84 @@ class SystemUIController:
             if direction not in direction_map:
                 return {"ok": False, "error": f"Invalid direction: {direction}"}
 
+            lines = []
             if x is not None and y is not None:
-                move_script = f'set mouseLocation to {{{x}, {y}}}\nmove to mouseLocation\n'
-            else:
-                move_script = ""
-
-            script = f"""
-            tell application "System Events"
-                {move_script}
-                scroll {direction_map[direction]} {amount}
-            end tell
-            """
-            self._run_applescript(script)
+                lines.append(f'tell application "System Events" to move to {{{x}, {y}}}')
+            lines.append(f'tell application "System Events" to scroll {direction_map[direction]} {amount}')
+            self._run_applescript("\n".join(lines))
             return {"ok": True, "action": "scroll", "direction": direction, "amount": amount}
         except Exception as e:
             return {"ok": False, "error": str(e)}
 
     # ========== DOCK INTERACTION ==========
 
+    def _dock_snapshot(self) -> List[tuple]:
+        """(title, element) rows for every Dock item, ~2 IPCs per item.
+
+        The JXA version read .length and .title() per button through
+        System Events - two IPCs per property per element. Here children
+        arrive as whole CFArrays and title+role are fetched together with
+        AXUIElementCopyMultipleAttributeValues.
+        """
+        from ApplicationServices import (
+            AXUIElementCreateApplication, AXUIElementCopyAttributeValue,
+            AXUIElementCopyMultipleAttributeValues, kAXChildrenAttribute,
+            kAXTitleAttribute, kAXRoleAttribute)
+        from AppKit import NSWorkspace
+
+        pid = None
+        for app in NSWorkspace.sharedWorkspace().runningApplications():
+            if str(app.localizedName()) == "Dock":
+                pid = app.processIdentifier()
+                break
+        if pid is None:
+            return []
+
+        items = []
+        stack = deque([(AXUIElementCreateApplication(pid), 0)])
+        while stack:
+            element, depth = stack.popleft()
+            if depth > 3:
+                continue
+            err, pair = AXUIElementCopyMultipleAttributeValues(
+                element, [kAXTitleAttribute, kAXRoleAttribute], 0, None)
+            if err == 0 and pair and str(pair[1]) == "AXDockItem" and pair[0]:
+                items.append((str(pair[0]), element))
+                continue
+            err, children = AXUIElementCopyAttributeValue(
+                element, kAXChildrenAttribute, None)
+            if err == 0 and children:
+                stack.extend((c, depth + 1) for c in children)
+        return items
+
+    def _dock_click_ax(self, app_name: str) -> Optional[Dict[str, Any]]:
+        """Press a Dock item via AX; returns None when PyObjC is unusable"""
+        try:
+            from ApplicationServices import AXUIElementPerformAction, kAXPressAction
+
+            want = app_name.lower()
+            for fresh in (False, True):
+                if self._dock_items is None or fresh:
+                    self._dock_items = self._dock_snapshot()
+                for title, element in self._dock_items:
+                    if want in title.lower():
+                        if AXUIElementPerformAction(element, kAXPressAction) == 0:
+                            return {"ok": True, "app": title}
+                        break  # stale snapshot - rebuild and retry once
+                else:
+                    if fresh:
+                        return {"ok": False, "error": "App not found in Dock"}
+            return {"ok": False, "error": "App not found in Dock"}
+        except Exception:
+            return None
+
     def dock_click(self, app_name: str) -> Dict[str, Any]:
         """Click an app in the Dock"""
+        result = self._dock_click_ax(app_name)
+        if result is not None:
+            return result
         try:
-            jxa_script = f"""
-            function run(argv) {{
-                const appName = argv[0];
-                const se = Application("System Events");
-                const dock = se.processes["Dock"];
-
-                if (!dock.exists()) {{
-                    return JSON.stringify({{ok: false, error: "Dock not found"}});
-                }}
-
-                try {{
-                    const dockItems = dock.windows[0].groups[0].groups;
-                    for (const group of dockItems()) {{
-                        if (group.buttons && group.buttons.length > 0) {{
-                            for (const button of group.buttons()) {{
-                                const title = String(button.title());
-                                if (title.toLowerCase().includes(appName.toLowerCase())) {{
-                                    button.click();
-                                    return JSON.stringify({{ok: true, app: title}});
-                                }}
-                            }}
-                        }}
-                    }}
-                    return JSON.stringify({{ok: false, error: "App not found in Dock"}});
-                }} catch(e) {{
-                    return JSON.stringify({{ok: false, error: e.message}});
-                }}
-            }}
-            """
-            result = self._run_jxa(jxa_script, app_name)
-            return json.loads(result)
+            return self._jxa_op("dockClick", app_name)
         except Exception as e:
             return {"ok": False, "error": str(e)}
 
@@ -169,44 +491,62 @@ class SystemUIController:
     def menu_bar_click(self, item_name: str) -> Dict[str, Any]:
         """Click an item in the menu bar (top right area)"""
         try:
-            jxa_script = f"""
-            function run(argv) {{
-                const itemName = argv[0];
-                const se = Application("System Events");
-
-                try {{
-                    const menuBarItems = se.processes["SystemUIServer"].menuBars[0].menuBarItems;
-                    for (const item of menuBarItems()) {{
-                        const title = String(item.title ? item.title() : item.name());
-                        if (title.toLowerCase().includes(itemName.toLowerCase())) {{
-                            item.click();
-                            return JSON.stringify({{ok: true, item: title}});
-                        }}
-                    }}
-                    return JSON.stringify({{ok: false, error: "Menu bar item not found"}});
-                }} catch(e) {{
-                    return JSON.stringify({{ok: false, error: e.message}});
-                }}
-            }}
-            """
-            result = self._run_jxa(jxa_script, item_name)
-            return json.loads(result)
+            return self._jxa_op("menuBarClick", item_name)
         except Exception as e:
             return {"ok": False, "error": str(e)}
 
     # ========== SPOTLIGHT SEARCH ==========
 
+    @staticmethod
+    def _wait_until(pred, timeout: float = 2.0, interval: float = 0.02) -> bool:
+        """Poll pred until it returns true or the deadline passes.
+
+        Lets exceptions propagate: a pred that cannot run at all should
+        send the caller to its fixed-delay fallback immediately, not spin
+        for the whole timeout.
+        """
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if pred():
+                return True
+            time.sleep(interval)
+        return False
+
+    @staticmethod
+    def _ax_window_exists(process_name: str) -> bool:
+        """True when the named process currently has at least one window"""
+        from ApplicationServices import (
+            AXUIElementCreateApplication, AXUIElementCopyAttributeValue,
+            kAXWindowsAttribute)
+        from AppKit import NSWorkspace
+
+        for app in NSWorkspace.sharedWorkspace().runningApplications():
+            if str(app.localizedName()) == process_name:
+                err, windows = AXUIElementCopyAttributeValue(
+                    AXUIElementCreateApplication(app.processIdentifier()),
+                    kAXWindowsAttribute, None)
+                return err == 0 and bool(windows)
+        return False
+
     def global_search(self, query: str, open_first: bool = True) -> Dict[str, Any]:
         """Use Spotlight to search and optionally open first result"""
         try:
             # Open Spotlight
-            script = """
-            tell application "System Events"
-                key code 49 using command down  -- Cmd+Space
-                delay 0.5
-            end tell
-            """
-            self._run_applescript(script)
+            r = self.keystroke("space", ["command"])
+            if not r.get("ok"):
+                return r
+
+            # Wait until the Spotlight panel actually exists instead of a
+            # fixed delay: faster on fast machines, less flaky on slow ones
+            waited = False
+            if HAS_QUARTZ:
+                try:
+                    waited = True
+                    self._wait_until(lambda: self._ax_window_exists("Spotlight"))
+                except Exception:
+                    waited = False
+            if not waited:
+                time.sleep(0.5)
 
             # Type search query
             self.type_text(query)
@@ -222,38 +562,81 @@ class SystemUIController:
 
     # ========== KEYBOARD AUTOMATION ==========
 
+    @staticmethod
+    def _cg_flags(mods: List[str]) -> int:
+        return _MOD_FLAGS[_mod_key(mods)]
+
+    @staticmethod
+    def _cg_key_event(key: str, flags: int):
+        """Post a down/up keyboard CGEvent pair for one key"""
+        code = _KEY_CODES.get(key.lower(), 0)
+        for down in (True, False):
+            ev = CGEventCreateKeyboardEvent(None, code, down)
+            if key.lower() not in _KEY_CODES:
+                # Arbitrary characters ride on the unicode-string field,
+                # no layout-dependent key code needed
+                CGEventKeyboardSetUnicodeString(ev, len(key), key)
+            if flags:
+                CGEventSetFlags(ev, flags)
+            CGEventPost(kCGHIDEventTap, ev)
+
     def keystroke(self, key: str, modifiers: Optional[List[str]] = None) -> Dict[str, Any]:
         """Send keystroke with optional modifiers"""
+        mods = modifiers or []
+        if HAS_QUARTZ:
+            try:
+                self._cg_key_event(key, self._cg_flags(mods))
+                return {"ok": True, "key": key, "modifiers": mods}
+            except Exception:
+                pass  # fall back to AppleScript
         try:
-            mods = modifiers or []
-            mod_string = ""
-
-            if "command" in mods or "cmd" in mods:
-                mod_string += "command down, "
-            if "shift" in mods:
-                mod_string += "shift down, "
-            if "option" in mods or "alt" in mods:
-                mod_string += "option down, "
-            if "control" in mods or "ctrl" in mods:
-                mod_string += "control down, "
-
-            mod_string = mod_string.rstrip(", ")
-
-            if mod_string:
-                script = f'tell application "System Events" to keystroke "{key}" using {{{mod_string}}}'
-            else:
-                script = f'tell application "System Events" to keystroke "{key}"'
-
-            self._run_applescript(script)
+            self._run_applescript(_keystroke_script(key, _MOD_TABLE[_mod_key(mods)]))
             return {"ok": True, "key": key, "modifiers": mods}
         except Exception as e:
             return {"ok": False, "error": str(e)}
 
+    def keystroke_fast(self, key: str, modifiers: Optional[List[str]] = None) -> None:
+        """keystroke() for inner loops: returns None on success and raises
+        on failure, so tight typing loops allocate no result dicts"""
+        mods = modifiers or []
+        if HAS_QUARTZ:
+            self._cg_key_event(key, self._cg_flags(mods))
+            return
+        self._run_applescript(_keystroke_script(key, _MOD_TABLE[_mod_key(mods)]))
+
+    def type_text_fast(self, text: str) -> None:
+        """type_text() for inner loops: no result dict; raises on failure"""
+        if HAS_QUARTZ:
+            for i in range(0, len(text), 20):
+                chunk = text[i:i + 20]
+                for down in (True, False):
+                    ev = CGEventCreateKeyboardEvent(None, 0, down)
+                    CGEventKeyboardSetUnicodeString(ev, len(chunk), chunk)
+                    CGEventPost(kCGHIDEventTap, ev)
+            return
+        self._run_applescript(
+            'tell application "System Events" to keystroke '
+            f'"{_escape_script_string(text)}"')
+
     def type_text(self, text: str) -> Dict[str, Any]:
         """Type text using System Events"""
+        if HAS_QUARTZ:
+            try:
+                # One event pair carries a whole chunk of text; chunking
+                # keeps slow apps from dropping very long strings
+                for i in range(0, len(text), 20):
+                    chunk = text[i:i + 20]
+                    for down in (True, False):
+                        ev = CGEventCreateKeyboardEvent(None, 0, down)
+                        CGEventKeyboardSetUnicodeString(ev, len(chunk), chunk)
+                        CGEventPost(kCGHIDEventTap, ev)
+                return {"ok": True, "text": text}
+            except Exception:
+                pass  # fall back to AppleScript
         try:
-            # Escape quotes and special characters
-            escaped_text = text.replace('"', '\\"').replace('\\', '\\\\')
+            # Escape quotes and special characters (backslash first, or the
+            # escape for a quote gets re-escaped into a broken literal)
+            escaped_text = _escape_script_string(text)
             script = f'tell application "System Events" to keystroke "{escaped_text}"'
             self._run_applescript(script)
             return {"ok": True, "text": text}
@@ -276,39 +659,39 @@ class SystemUIController:
 
     def get_mouse_position(self) -> Dict[str, Any]:
         """Get current mouse cursor position"""
+        if HAS_QUARTZ:
+            try:
+                # Pure read, answered in-process; NSEvent uses a bottom-left
+                # origin so flip y into the top-left space the click methods use
+                p = NSEvent.mouseLocation()
+                height = CGDisplayBounds(CGMainDisplayID()).size.height
+                return {"ok": True, "x": int(p.x), "y": int(height - p.y)}
+            except Exception:
+                pass
         try:
-            jxa_script = """
-            function run() {
-                const se = Application("System Events");
-                const pos = se.mouseLocation();
-                return JSON.stringify({ok: true, x: pos[0], y: pos[1]});
-            }
-            """
-            result = self._run_jxa(jxa_script)
-            return json.loads(result)
+            return self._jxa_op("getMousePosition")
         except Exception as e:
             return {"ok": False, "error": str(e)}
 
     def get_screen_size(self) -> Dict[str, Any]:
         """Get screen dimensions"""
+        # Screen geometry only changes on display reconfiguration, so one
+        # query per controller lifetime is enough
+        if self._screen_size is not None:
+            return dict(self._screen_size)
+        if HAS_QUARTZ:
+            try:
+                b = CGDisplayBounds(CGMainDisplayID())
+                self._screen_size = {"ok": True, "width": int(b.size.width),
+                                     "height": int(b.size.height)}
+                return dict(self._screen_size)
+            except Exception:
+                pass
         try:
-            jxa_script = """
-            function run() {
-                const se = Application("System Events");
-                const desktops = se.desktops();
-                if (desktops.length > 0) {
-                    const bounds = desktops[0].bounds();
-                    return JSON.stringify({
-                        ok: true,
-                        width: bounds[2],
-                        height: bounds[3]
-                    });
-                }
-                return JSON.stringify({ok: false, error: "No desktop found"});
-            }
-            """
-            result = self._run_jxa(jxa_script)
-            return json.loads(result)
+            result = self._jxa_op("getScreenSize")
+            if result.get("ok"):
+                self._screen_size = result
+            return result
         except Exception as e:
             return {"ok": False, "error": str(e)}
 
@@ -317,95 +700,92 @@ class SystemUIController:
     def notification_interact(self, action: str = "click") -> Dict[str, Any]:
         """Interact with the most recent notification"""
         try:
-            jxa_script = f"""
-            function run(argv) {{
-                const action = argv[0];
-                const se = Application("System Events");
-
-                try {{
-                    const notifications = se.processes["NotificationCenter"];
-                    if (!notifications.exists()) {{
-                        return JSON.stringify({{ok: false, error: "No notifications found"}});
-                    }}
-
-                    const windows = notifications.windows();
-                    if (windows.length > 0) {{
-                        const latestNotification = windows[0];
-                        if (action === "click") {{
-                            latestNotification.click();
-                        }} else if (action === "dismiss") {{
-                            // Try to find close button
-                            const buttons = latestNotification.buttons();
-                            for (const btn of buttons) {{
-                                if (btn.title() === "Close") {{
-                                    btn.click();
-                                    break;
-                                }}
-                            }}
-                        }}
-                        return JSON.stringify({{ok: true, action: action}});
-                    }}
-                    return JSON.stringify({{ok: false, error: "No notification windows"}});
-                }} catch(e) {{
-                    return JSON.stringify({{ok: false, error: e.message}});
-                }}
-            }}
-            """
-            result = self._run_jxa(jxa_script, action)
-            return json.loads(result)
+            return self._jxa_op("notificationInteract", action)
         except Exception as e:
             return {"ok": False, "error": str(e)}
 
     # ========== FINDER UTILITIES ==========
 
+    def _ax_snapshot(self, pid: int) -> List[tuple]:
+        """Flatten one app's AX tree to (title, value, element) rows.
+
+        Children come back as one CFArray per AXUIElementCopyAttributeValue
+        call, so each tree level costs one IPC instead of one per element
+        the way the recursive JXA walk did.
+        """
+        from ApplicationServices import (
+            AXUIElementCreateApplication, AXUIElementCopyAttributeValue,
+            kAXChildrenAttribute, kAXTitleAttribute, kAXValueAttribute,
+            kAXWindowsAttribute)
+
+        rows = []
+        app_element = AXUIElementCreateApplication(pid)
+        err, windows = AXUIElementCopyAttributeValue(
+            app_element, kAXWindowsAttribute, None)
+        if err != 0 or not windows:
+            return rows
+        # Iterative DFS, depth-capped like the JXA walk
+        stack = deque((w, 0) for w in windows)
+        while stack:
+            element, depth = stack.pop()
+            if depth > 8:
+                continue
+            _, title = AXUIElementCopyAttributeValue(
+                element, kAXTitleAttribute, None)
+            _, value = AXUIElementCopyAttributeValue(
+                element, kAXValueAttribute, None)
+            rows.append((str(title).lower() if title else "",
+                         str(value).lower() if value else "", element))
+            _, children = AXUIElementCopyAttributeValue(
+                element, kAXChildrenAttribute, None)
+            if children:
+                stack.extend((c, depth + 1) for c in children)
+        return rows
+
+    def _find_and_click_text_ax(self, text: str,
+                                app_name: str = None) -> Optional[Dict[str, Any]]:
+        """In-process AX search over cached snapshots; returns None when
+        PyObjC is unusable"""
+        try:
+            from ApplicationServices import AXUIElementPerformAction, kAXPressAction
+            from AppKit import NSWorkspace, NSApplicationActivationPolicyRegular
+
+            want = text.lower()
+            pids = []
+            for app in NSWorkspace.sharedWorkspace().runningApplications():
+                if app_name:
+                    if str(app.localizedName()) == app_name:
+                        pids.append(app.processIdentifier())
+                elif app.activationPolicy() == NSApplicationActivationPolicyRegular:
+                    pids.append(app.processIdentifier())
+            if app_name and not pids:
+                return {"ok": False, "error": "Text not found"}
+
+            for pid in pids:
+                rows = self._ax_cache.get(pid, self._ax_snapshot)
+                for title_str, value_str, element in rows:
+                    if want in title_str or want in value_str:
+                        if AXUIElementPerformAction(element, kAXPressAction) == 0:
+                            return {"ok": True, "text": text}
+                        # Pressing a cached element failed - likely a stale
+                        # snapshot; rebuild once and retry this app
+                        self._ax_cache.invalidate(pid)
+                        for t, v, el in self._ax_cache.get(pid, self._ax_snapshot):
+                            if (want in t or want in v) and \
+                                    AXUIElementPerformAction(el, kAXPressAction) == 0:
+                                return {"ok": True, "text": text}
+                        break
+            return {"ok": False, "error": "Text not found"}
+        except Exception:
+            # Missing PyObjC or accessibility permission - use the JXA path
+            return None
+
     def find_and_click_text(self, text: str, app_name: str = None) -> Dict[str, Any]:
         """Find UI element containing specific text and click it"""
+        result = self._find_and_click_text_ax(text, app_name)
+        if result is not None:
+            return result
         try:
-            target = f'processes["{app_name}"]' if app_name else 'processes'
-
-            jxa_script = f"""
-            function run(argv) {{
-                const searchText = argv[0];
-                const se = Application("System Events");
-
-                function searchInElement(element, depth = 0) {{
-                    if (depth > 8) return false;
-
-                    try {{
-                        const title = String(element.title ? element.title() : element.name()).toLowerCase();
-                        const value = element.value ? String(element.value()).toLowerCase() : "";
-
-                        if (title.includes(searchText.toLowerCase()) || value.includes(searchText.toLowerCase())) {{
-                            if (element.actions && element.actions.byName("AXPress").exists) {{
-                                element.actions.byName("AXPress").perform();
-                                return true;
-                            }}
-                        }}
-
-                        if (element.uiElements && element.uiElements.length > 0) {{
-                            for (const child of element.uiElements()) {{
-                                if (searchInElement(child, depth + 1)) return true;
-                            }}
-                        }}
-                    }} catch(e) {{
-                        // Ignore errors and continue
-                    }}
-                    return false;
-                }}
-
-                const processes = se.{target};
-                for (const process of processes()) {{
-                    for (const window of process.windows()) {{
-                        if (searchInElement(window)) {{
-                            return JSON.stringify({{ok: true, text: searchText}});
-                        }}
-                    }}
-                }}
-
-                return JSON.stringify({{ok: false, error: "Text not found"}});
-            }}
-            """
-            result = self._run_jxa(jxa_script, text)
-            return json.loads(result)
+            return self._jxa_op("findAndClickText", text, app_name or "")
         except Exception as e:
-            return {"ok": False, "error": str(e)}
\ No newline at end of file
+            return {"ok": False, "error": str(e)}
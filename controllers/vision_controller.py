@@ -1,40 +1,167 @@
+import hashlib
 import json
+import struct
 import subprocess
 import time
 import tempfile
 import os
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Dict, Any, Tuple
 from pathlib import Path
 
+# Optional PyObjC path: posting CGEvents straight to WindowServer skips
+# the osascript round trip (~30-80ms) for synthetic clicks
+try:
+    from Quartz import (
+        CGEventCreateMouseEvent, CGEventPost,
+        kCGEventLeftMouseDown, kCGEventLeftMouseUp,
+        kCGHIDEventTap, kCGMouseButtonLeft)
+    HAS_QUARTZ = True
+except ImportError:
+    HAS_QUARTZ = False
+
+# Optional NumPy path: full-screen visual_diff becomes one vectorized
+# pass (Accelerate/NEON on macOS) instead of a per-pixel Python loop
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 class VisionController:
     """Computer vision automation for macOS using screenshots and OCR"""
 
+    _OCR_CACHE_MAX = 64
+
     def __init__(self):
         self.temp_dir = tempfile.gettempdir()
         self.screenshot_count = 0
-
-    def _get_temp_screenshot_path(self) -> str:
+        # Persistent interactive osascript co-process: clicks and screen
+        # probes become pipe round-trips instead of paying a fresh
+        # osascript spawn (~30-80ms) each. Falls back to per-call spawns
+        # if the session cannot be created.
+        try:
+            from controllers.performance_optimized import OsaSession
+            self._osa = OsaSession()
+        except Exception:
+            self._osa = None
+        self._screen_size = None  # memoized; see refresh_screen_size()
+        self._click_scpt = None  # lazily compiled; "" once compilation fails
+        # OCR results keyed by image content hash; bounded LRU
+        self._ocr_cache: OrderedDict = OrderedDict()
+
+    def _get_temp_screenshot_path(self, ext: str = "png") -> str:
         """Generate unique screenshot filename"""
         self.screenshot_count += 1
-        return os.path.join(self.temp_dir, f"vision_screenshot_{self.screenshot_count}.png")
+        return os.path.join(self.temp_dir, f"vision_screenshot_{self.screenshot_count}.{ext}")
+
+    def _slot_path(self, slot: str, ext: str) -> str:
+        """Stable path for a named reusable capture slot.
+
+        Polling loops overwrite the same one or two files instead of
+        allocating a fresh multi-megabyte temp file per iteration -
+        no tmpfs bloat, no inode churn, nothing for cleanup to sweep.
+        """
+        return os.path.join(self.temp_dir, f"vision_slot_{slot}.{ext}")
 
     def _run_applescript(self, script: str) -> str:
         """Execute AppleScript and return output"""
+        if self._osa is not None:
+            result = self._osa.send(script)
+            if result["ok"]:
+                output = result.get("output", [])
+                # Interactive mode reports errors inline rather than via
+                # the exit code, so surface them the same way a spawn would
+                err = next((l for l in output if "error:" in l), None)
+                if err:
+                    raise RuntimeError(f"AppleScript error: {err.strip()}")
+                return "\n".join(output).strip()
+            # Session died or timed out - fall back to a one-shot spawn
         cmd = ["osascript", "-e", script]
         result = subprocess.run(cmd, capture_output=True, text=True)
         if result.returncode != 0:
             raise RuntimeError(f"AppleScript error: {result.stderr.strip()}")
         return result.stdout.strip()
 
+    def close(self):
+        """Terminate the resident osascript session, if any"""
+        if self._osa is not None:
+            self._osa.close()
+
+    @staticmethod
+    def _cg_click(x: int, y: int) -> None:
+        """Post a left click straight to WindowServer via CGEvents"""
+        down = CGEventCreateMouseEvent(None, kCGEventLeftMouseDown, (x, y), kCGMouseButtonLeft)
+        up = CGEventCreateMouseEvent(None, kCGEventLeftMouseUp, (x, y), kCGMouseButtonLeft)
+        CGEventPost(kCGHIDEventTap, down)
+        CGEventPost(kCGHIDEventTap, up)
+
+    def _compiled_click(self) -> str:
+        """Compile the parameterized click script once; returns its path,
+        or an empty string when osacompile is unavailable or fails"""
+        if self._click_scpt is None:
+            script = ('on run argv\n'
+                      'tell application "System Events" to click at '
+                      '{item 1 of argv as integer, item 2 of argv as integer}\n'
+                      'end run')
+            target = Path.home() / ".cache" / "super_interpreter" / "vision_click.scpt"
+            try:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                subprocess.run(["osacompile", "-o", str(target), "-e", script],
+                               check=True, capture_output=True, timeout=10)
+                self._click_scpt = str(target)
+            except Exception:
+                self._click_scpt = ""
+        return self._click_scpt
+
+    def _click_at(self, x: int, y: int) -> str:
+        """Synthetic click at coordinates; returns the method used.
+
+        CGEventPost costs hundreds of microseconds against the
+        osascript click's tens of milliseconds, so it goes first. Next
+        comes the resident session; without one, spawning osascript on
+        the precompiled .scpt skips the per-call AppleScript compile.
+        The inline script is the last resort.
+        """
+        if HAS_QUARTZ:
+            try:
+                self._cg_click(x, y)
+                return "cgevent"
+            except Exception:
+                pass
+        if self._osa is None:
+            scpt = self._compiled_click()
+            if scpt:
+                result = subprocess.run(["osascript", scpt, str(x), str(y)],
+                                        capture_output=True, text=True)
+                if result.returncode == 0:
+                    return "compiled_scpt"
+        self._run_applescript(f'tell application "System Events" to click at {{{x}, {y}}}')
+        return "applescript"
+
     # ========== SCREENSHOT UTILITIES ==========
 
-    def screenshot_full(self, path: str = None) -> Dict[str, Any]:
-        """Take full screen screenshot"""
+    def screenshot_full(self, path: str = None, fmt: str = "png",
+                        reuse_slot: str = None) -> Dict[str, Any]:
+        """Take full screen screenshot.
+
+        fmt="bmp" skips the PNG deflate pass inside screencapture
+        (~20x faster to write for a full screen) - use it for captures
+        that are consumed immediately, keep the PNG default for
+        anything handed back to callers. reuse_slot names a stable
+        path that is overwritten on every call.
+        """
         try:
             if path is None:
-                path = self._get_temp_screenshot_path()
+                path = (self._slot_path(reuse_slot, fmt) if reuse_slot
+                        else self._get_temp_screenshot_path(ext=fmt))
 
-            cmd = ["screencapture", "-x", path]
+            cmd = ["screencapture", "-x"]
+            if fmt != "png":
+                cmd += ["-t", fmt]
+            cmd.append(path)
             result = subprocess.run(cmd, capture_output=True)
 
             if result.returncode == 0:
@@ -44,14 +171,20 @@ class VisionController:
         except Exception as e:
             return {"ok": False, "error": str(e)}
 
-    def screenshot_region(self, x: int, y: int, width: int, height: int, path: str = None) -> Dict[str, Any]:
+    def screenshot_region(self, x: int, y: int, width: int, height: int,
+                          path: str = None, fmt: str = "png",
+                          reuse_slot: str = None) -> Dict[str, Any]:
         """Take screenshot of specific region"""
         try:
             if path is None:
-                path = self._get_temp_screenshot_path()
+                path = (self._slot_path(reuse_slot, fmt) if reuse_slot
+                        else self._get_temp_screenshot_path(ext=fmt))
 
             # screencapture -R uses format: x,y,width,height
-            cmd = ["screencapture", "-x", "-R", f"{x},{y},{width},{height}", path]
+            cmd = ["screencapture", "-x", "-R", f"{x},{y},{width},{height}"]
+            if fmt != "png":
+                cmd += ["-t", fmt]
+            cmd.append(path)
             result = subprocess.run(cmd, capture_output=True)
 
             if result.returncode == 0:
@@ -61,17 +194,21 @@ class VisionController:
         except Exception as e:
             return {"ok": False, "error": str(e)}
 
-    def screenshot_window(self, window_id: int = None, path: str = None) -> Dict[str, Any]:
+    def screenshot_window(self, window_id: int = None, path: str = None,
+                          fmt: str = "png") -> Dict[str, Any]:
         """Take screenshot of specific window"""
         try:
             if path is None:
-                path = self._get_temp_screenshot_path()
+                path = self._get_temp_screenshot_path(ext=fmt)
 
             if window_id:
-                cmd = ["screencapture", "-x", "-l", str(window_id), path]
+                cmd = ["screencapture", "-x", "-l", str(window_id)]
             else:
                 # Interactive window selection
-                cmd = ["screencapture", "-x", "-w", path]
+                cmd = ["screencapture", "-x", "-w"]
+            if fmt != "png":
+                cmd += ["-t", fmt]
+            cmd.append(path)
 
             result = subprocess.run(cmd, capture_output=True)
 
@@ -116,20 +253,61 @@ class VisionController:
             x, y = match_result.get("center", [0, 0])
 
             # Click at the center of found image
-            script = f"""
-            tell application "System Events"
-                click at {{{x}, {y}}}
-            end tell
-            """
-            self._run_applescript(script)
-
-            return {"ok": True, "clicked_at": [x, y], "template": template_path}
+            method = self._click_at(x, y)
+
+            return {"ok": True, "clicked_at": [x, y], "template": template_path,
+                    "method": method}
         except Exception as e:
             return {"ok": False, "error": str(e)}
 
     # ========== OCR TEXT RECOGNITION ==========
 
-    def read_text_ocr(self, image_path: str = None, region: Tuple[int, int, int, int] = None) -> Dict[str, Any]:
+    def _cache_ocr(self, key: Optional[Any], text: str,
+                   method: str) -> Dict[str, Any]:
+        """Store an OCR result in the bounded LRU and build the result"""
+        if key is not None:
+            self._ocr_cache[key] = text
+            self._ocr_cache.move_to_end(key)
+            while len(self._ocr_cache) > self._OCR_CACHE_MAX:
+                self._ocr_cache.popitem(last=False)
+        return {"ok": True, "text": text, "method": method}
+
+    def _ocr_cache_key(self, image_path: str) -> Optional[Any]:
+        """Perceptual cache key (64-bit dHash) with exact-hash fallback.
+
+        dHash keys let near-identical captures share an entry even when
+        compression noise changes the bytes; when the hash pipeline
+        (sips/BMP) is unavailable an exact blake2b digest still gives
+        byte-identical hits.
+        """
+        try:
+            return self._dhash(image_path)
+        except Exception:
+            pass
+        try:
+            with open(image_path, "rb") as f:
+                return hashlib.blake2b(f.read(), digest_size=16).digest()
+        except OSError:
+            return None
+
+    def _ocr_lookup(self, key: Optional[Any], fuzz: int) -> Optional[str]:
+        """Cache probe: exact for digests, Hamming <= fuzz for dHashes"""
+        if key is None:
+            return None
+        if key in self._ocr_cache:
+            self._ocr_cache.move_to_end(key)
+            return self._ocr_cache[key]
+        if isinstance(key, int) and fuzz > 0:
+            # The cache holds at most 64 entries, so a linear popcount
+            # scan costs less than a single OCR millisecond
+            for stored in self._ocr_cache:
+                if isinstance(stored, int) and (stored ^ key).bit_count() <= fuzz:
+                    self._ocr_cache.move_to_end(stored)
+                    return self._ocr_cache[stored]
+        return None
+
+    def read_text_ocr(self, image_path: str = None, region: Tuple[int, int, int, int] = None,
+                      fuzz: int = 4) -> Dict[str, Any]:
         """Extract text from screenshot using macOS built-in OCR"""
         try:
             if image_path is None:
@@ -143,6 +321,15 @@ class VisionController:
                     return {"ok": False, "error": "Failed to capture screenshot"}
                 image_path = screenshot["path"]
 
+            # OCR dominates this path (~0.5-2s per call); memoize with a
+            # fuzzy perceptual key so retry loops over a visually
+            # unchanged screen hit the cache even when recompression
+            # shifts the raw bytes between captures
+            key = self._ocr_cache_key(image_path)
+            cached = self._ocr_lookup(key, fuzz)
+            if cached is not None:
+                return {"ok": True, "text": cached, "method": "cache"}
+
             # Use macOS Shortcuts for OCR (requires Monterey+)
             # Alternative approach using Vision framework via Python
             try:
@@ -151,17 +338,23 @@ class VisionController:
                 result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
 
                 if result.returncode == 0 and result.stdout.strip():
-                    return {"ok": True, "text": result.stdout.strip(), "method": "shortcuts"}
+                    return self._cache_ocr(key, result.stdout.strip(), "shortcuts")
             except (subprocess.TimeoutExpired, FileNotFoundError):
                 pass
 
-            # Fallback: Try using tesseract if installed
+            # Fallback: Try using tesseract if installed.
+            # OMP_THREAD_LIMIT=1 keeps tesseract single-threaded; its
+            # OpenMP worker pool thrashes badly when several OCRs run at
+            # once and buys nothing for a single page. (A resident
+            # `tesseract - -` process is not an option: it exits as soon
+            # as stdin hits EOF, so each image would still cost a spawn.)
             try:
                 cmd = ["tesseract", image_path, "stdout"]
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+                result = subprocess.run(cmd, capture_output=True, text=True, timeout=10,
+                                        env={**os.environ, "OMP_THREAD_LIMIT": "1"})
 
                 if result.returncode == 0:
-                    return {"ok": True, "text": result.stdout.strip(), "method": "tesseract"}
+                    return self._cache_ocr(key, result.stdout.strip(), "tesseract")
             except (subprocess.TimeoutExpired, FileNotFoundError):
                 pass
 
@@ -178,6 +371,45 @@ class VisionController:
         except Exception as e:
             return {"ok": False, "error": str(e)}
 
+    def read_text_ocr_tiled(self, n_tiles: int = 4) -> Dict[str, Any]:
+        """OCR the full screen as horizontal bands processed in parallel.
+
+        One single-threaded tesseract per tile scales close to linearly
+        up to the core count, whereas one multi-threaded tesseract (or
+        several unconstrained ones) stalls on OpenMP pool contention -
+        hence OMP_THREAD_LIMIT=1 in every worker's environment.
+        """
+        try:
+            screen = self._get_screen_size()
+            if not screen["ok"]:
+                return {"ok": False, "error": "Failed to get screen size"}
+            width, height = screen["width"], screen["height"]
+            band = height // n_tiles
+
+            def _ocr_tile(i: int) -> str:
+                y = i * band
+                h = band if i < n_tiles - 1 else height - y
+                shot = self.screenshot_region(0, y, width, h, fmt="bmp")
+                if not shot["ok"]:
+                    return ""
+                result = subprocess.run(
+                    ["tesseract", shot["path"], "stdout"],
+                    capture_output=True, text=True, timeout=30,
+                    env={**os.environ, "OMP_THREAD_LIMIT": "1"})
+                return result.stdout.strip() if result.returncode == 0 else ""
+
+            workers = min(n_tiles, os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+                tiles = list(ex.map(_ocr_tile, range(n_tiles)))
+
+            text = "\n".join(t for t in tiles if t)
+            if text:
+                return {"ok": True, "text": text,
+                        "method": "tesseract_tiled", "tiles": n_tiles}
+            return {"ok": False, "error": "No text extracted from any tile"}
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
     def find_text_and_click(self, text: str, region: Tuple[int, int, int, int] = None) -> Dict[str, Any]:
         """Find text on screen using OCR and click on it"""
         try:
@@ -212,17 +444,13 @@ class VisionController:
                     click_x, click_y = 640, 360  # Default fallback
 
             # Click at estimated position
-            script = f"""
-            tell application "System Events"
-                click at {{{click_x}, {click_y}}}
-            end tell
-            """
-            self._run_applescript(script)
+            method = self._click_at(click_x, click_y)
 
             return {
                 "ok": True,
                 "text_found": text,
                 "clicked_at": [click_x, click_y],
+                "method": method,
                 "note": "Clicked at estimated position - for precise clicking, use coordinate-based methods"
             }
 
@@ -231,20 +459,57 @@ class VisionController:
 
     # ========== COLOR AND PIXEL UTILITIES ==========
 
+    @staticmethod
+    def _png_first_pixel(path: str) -> Tuple[int, int, int]:
+        """RGB of the first pixel of a PNG using only the stdlib.
+
+        Walks the chunk stream with struct, inflates the IDAT payload
+        with zlib and skips the row filter byte. For the first pixel of
+        the first row every PNG filter type leaves the raw bytes intact
+        (no left or up neighbour to subtract), so no filter
+        reconstruction is needed.
+        """
+        data = Path(path).read_bytes()
+        if data[:8] != b"\x89PNG\r\n\x1a\n":
+            raise ValueError("not a PNG file")
+        pos = 8
+        channels = None
+        idat = b""
+        while pos + 8 <= len(data):
+            length, ctype = struct.unpack_from(">I4s", data, pos)
+            pos += 8
+            payload = data[pos:pos + length]
+            pos += length + 4  # skip CRC
+            if ctype == b"IHDR":
+                bit_depth, color_type = payload[8], payload[9]
+                if bit_depth != 8 or color_type not in (0, 2, 4, 6):
+                    raise ValueError("unsupported PNG layout")
+                channels = {0: 1, 2: 3, 4: 2, 6: 4}[color_type]
+            elif ctype == b"IDAT":
+                idat += payload
+            elif ctype == b"IEND":
+                break
+        if channels is None or not idat:
+            raise ValueError("malformed PNG")
+        px = zlib.decompress(idat)[1:1 + channels]  # byte 0 is the filter
+        if channels < 3:  # grayscale
+            return (px[0], px[0], px[0])
+        return (px[0], px[1], px[2])
+
     def get_pixel_color(self, x: int, y: int) -> Dict[str, Any]:
         """Get RGB color of pixel at coordinates"""
         try:
-            # Take 1x1 screenshot at the specific pixel
+            # Take 1x1 screenshot at the specific pixel and decode it
+            # inline - a one-pixel PNG needs no imaging library
             screenshot = self.screenshot_region(x, y, 1, 1)
             if not screenshot["ok"]:
                 return {"ok": False, "error": "Failed to capture pixel"}
 
-            # This would require image processing to extract RGB values
-            # For now, return a placeholder that can be extended
+            r, g, b = self._png_first_pixel(screenshot["path"])
             return {
-                "ok": False,
-                "error": "Pixel color reading requires image processing library",
-                "todo": "Implement with PIL or opencv-python",
+                "ok": True,
+                "rgb": [r, g, b],
+                "hex": f"#{r:02x}{g:02x}{b:02x}",
                 "coordinates": [x, y]
             }
 
@@ -271,33 +536,158 @@ class VisionController:
 
     # ========== VISUAL CHANGE DETECTION ==========
 
-    def visual_diff(self, before_image: str, after_image: str = None) -> Dict[str, Any]:
-        """Compare two screenshots to detect changes"""
+    @staticmethod
+    def _bmp_pixels(path: str) -> Tuple[int, int, List[List[Tuple[int, int, int]]]]:
+        """Decode an uncompressed 24/32-bit BMP into top-down (r,g,b) rows"""
+        data = Path(path).read_bytes()
+        if data[:2] != b"BM":
+            raise ValueError("not a BMP file")
+        offset = struct.unpack_from("<I", data, 10)[0]
+        width = struct.unpack_from("<i", data, 18)[0]
+        height = struct.unpack_from("<i", data, 22)[0]
+        bpp = struct.unpack_from("<H", data, 28)[0]
+        if bpp not in (24, 32):
+            raise ValueError(f"unsupported BMP depth: {bpp}")
+        step = bpp // 8
+        row_bytes = (width * step + 3) & ~3  # rows pad to 4 bytes
+        flipped = height > 0  # positive height means bottom-up storage
+        height = abs(height)
+        rows = []
+        for row in range(height):
+            src = height - 1 - row if flipped else row
+            base = offset + src * row_bytes
+            line = []
+            for col in range(width):
+                b, g, r = data[base + col * step: base + col * step + 3]
+                line.append((r, g, b))
+            rows.append(line)
+        return width, height, rows
+
+    def _dhash(self, image_path: str) -> int:
+        """64-bit difference hash: 9x8 grayscale downsample, each bit is
+        a left-vs-right brightness comparison. Two captures of the same
+        screen hash identically regardless of compression noise, and any
+        visible change flips bits - unlike the file-size proxy this used
+        to rely on."""
+        small = os.path.join(self.temp_dir, "vision_dhash.bmp")
+        subprocess.run(
+            ["sips", "-z", "8", "9", "-s", "format", "bmp",
+             image_path, "--out", small],
+            capture_output=True, timeout=10, check=True)
+        width, height, rows = self._bmp_pixels(small)
+        if width < 9 or height < 8:
+            raise ValueError("downsample too small for dHash")
+        bits = 0
+        for row in rows[:8]:
+            gray = [(r * 299 + g * 587 + b * 114) // 1000 for r, g, b in row[:9]]
+            for x in range(8):
+                bits = (bits << 1) | (1 if gray[x] > gray[x + 1] else 0)
+        return bits
+
+    @staticmethod
+    def _bmp_ndarray(path: str):
+        """BMP pixel data as an (h, w, channels) uint8 ndarray.
+
+        np.frombuffer views the file bytes in place; the reshape/slice
+        handles the 4-byte row stride padding and the bottom-up row
+        order without copying per pixel.
+        """
+        data = Path(path).read_bytes()
+        if data[:2] != b"BM":
+            raise ValueError("not a BMP file")
+        offset = struct.unpack_from("<I", data, 10)[0]
+        width = struct.unpack_from("<i", data, 18)[0]
+        height = struct.unpack_from("<i", data, 22)[0]
+        bpp = struct.unpack_from("<H", data, 28)[0]
+        if bpp not in (24, 32):
+            raise ValueError(f"unsupported BMP depth: {bpp}")
+        step = bpp // 8
+        row_bytes = (width * step + 3) & ~3
+        flipped = height > 0
+        height = abs(height)
+        arr = np.frombuffer(data, dtype=np.uint8,
+                            count=row_bytes * height, offset=offset)
+        arr = arr.reshape(height, row_bytes)[:, :width * step]
+        arr = arr.reshape(height, width, step)
+        if flipped:
+            arr = arr[::-1]
+        return arr
+
+    def visual_diff(self, before_image: str, after_image: str = None,
+                    tolerance: int = 16) -> Dict[str, Any]:
+        """Compare two screenshots to detect changes.
+
+        With NumPy and BMP inputs this is an exact per-pixel count in
+        one vectorized absdiff pass; otherwise it degrades to a dHash
+        Hamming comparison, which still answers "how different" without
+        any imaging dependency.
+        """
         try:
             if after_image is None:
                 # Take current screenshot for comparison
-                current_screenshot = self.screenshot_full()
+                current_screenshot = self.screenshot_full(fmt="bmp")
                 if not current_screenshot["ok"]:
                     return {"ok": False, "error": "Failed to capture current screenshot"}
                 after_image = current_screenshot["path"]
 
-            # This would require image processing for diff analysis
+            if HAS_NUMPY:
+                try:
+                    a = self._bmp_ndarray(before_image)
+                    b = self._bmp_ndarray(after_image)
+                    if a.shape == b.shape:
+                        diff = np.abs(a.astype(np.int16) - b.astype(np.int16)).max(axis=2)
+                        changed = int(np.count_nonzero(diff > tolerance))
+                        return {
+                            "ok": True,
+                            "changed_pixels": changed,
+                            "fraction": changed / diff.size,
+                            "method": "numpy"
+                        }
+                    # Different geometry is trivially "everything changed"
+                    return {"ok": True, "changed_pixels": int(max(a.size, b.size) // 3),
+                            "fraction": 1.0, "method": "numpy"}
+                except ValueError:
+                    pass  # not BMPs - the dHash path converts via sips
+
+            distance = (self._dhash(before_image) ^ self._dhash(after_image)).bit_count()
             return {
-                "ok": False,
-                "error": "Visual diff requires image processing library",
-                "todo": "Implement with PIL or opencv-python",
-                "images": {"before": before_image, "after": after_image}
+                "ok": True,
+                "hamming_distance": distance,
+                "fraction": distance / 64,
+                "method": "dhash"
             }
 
         except Exception as e:
             return {"ok": False, "error": str(e)}
 
-    def wait_for_visual_change(self, reference_image: str = None, timeout: int = 10, poll_interval: float = 0.5) -> Dict[str, Any]:
+    def wait_for_visual_change(self, reference_image: str = None, timeout: int = 10,
+                               poll_interval: float = 0.5,
+                               probe_region: Tuple[int, int, int, int] = None) -> Dict[str, Any]:
         """Wait for screen to change from reference image with adaptive polling (CPU-efficient)"""
         try:
+            # A small probe answers "did anything change" while moving a
+            # tiny fraction of the pixels a full-screen capture would.
+            # Default: 256x256 around the screen centre; full screen only
+            # when the screen size cannot be determined.
+            if probe_region is None and reference_image is None:
+                screen = self._get_screen_size()
+                if screen["ok"]:
+                    probe_region = (max(screen["width"] // 2 - 128, 0),
+                                    max(screen["height"] // 2 - 128, 0),
+                                    256, 256)
+
+            def _capture(slot):
+                # BMP because the capture is hashed and discarded, so
+                # PNG compression would be pure overhead; named slots so
+                # the loop ping-pongs between two stable files instead
+                # of leaving one temp file per poll behind
+                if probe_region is not None:
+                    return self.screenshot_region(*probe_region, fmt="bmp",
+                                                  reuse_slot=slot)
+                return self.screenshot_full(fmt="bmp", reuse_slot=slot)
+
             if reference_image is None:
-                # Take reference screenshot
-                ref_screenshot = self.screenshot_full()
+                ref_screenshot = _capture("probe_ref")
                 if not ref_screenshot["ok"]:
                     return {"ok": False, "error": "Failed to capture reference screenshot"}
                 reference_image = ref_screenshot["path"]
@@ -306,27 +696,41 @@ class VisionController:
             interval = poll_interval
             max_interval = 2.0  # Cap polling at 2 seconds
 
+            # Hash the reference once; if sips/BMP decoding is unavailable
+            # fall back to the old file-size proxy for the whole wait
+            try:
+                ref_hash = self._dhash(reference_image)
+            except Exception:
+                ref_hash = None
+
+            flip = False
             while time.time() - start_time < timeout:
-                # Take current screenshot
-                current_screenshot = self.screenshot_full()
+                # Capture the same probe (or full screen) as the reference
+                current_screenshot = _capture("probe_b" if flip else "probe_a")
+                flip = not flip
                 if not current_screenshot["ok"]:
                     time.sleep(interval)
                     continue
 
-                # Compare with reference (simplified check using file size as proxy)
                 try:
-                    ref_size = os.path.getsize(reference_image)
-                    current_size = os.path.getsize(current_screenshot["path"])
-
-                    # If file sizes differ significantly, assume visual change
-                    if abs(ref_size - current_size) > ref_size * 0.02:  # 2% difference threshold
+                    if ref_hash is not None:
+                        cur_hash = self._dhash(current_screenshot["path"])
+                        changed = (ref_hash ^ cur_hash).bit_count() > 10
+                    else:
+                        # File-size proxy: misses equal-sized changes and
+                        # misfires on deflate drift, but needs no tooling
+                        ref_size = os.path.getsize(reference_image)
+                        current_size = os.path.getsize(current_screenshot["path"])
+                        changed = abs(ref_size - current_size) > ref_size * 0.02
+
+                    if changed:
                         return {
                             "ok": True,
                             "changed": True,
                             "wait_time": time.time() - start_time,
                             "current_screenshot": current_screenshot["path"]
                         }
-                except OSError:
+                except (OSError, ValueError, subprocess.SubprocessError):
                     pass
 
                 # Adaptive polling - increase interval if no changes detected
@@ -341,34 +745,56 @@ class VisionController:
     # ========== UTILITY METHODS ==========
 
     def _get_screen_size(self) -> Dict[str, Any]:
-        """Get screen dimensions"""
+        """Get screen dimensions (memoized - constant for a session)"""
+        if self._screen_size is not None:
+            return self._screen_size
         try:
-            script = """
-            tell application "System Events"
-                set screenBounds to bounds of desktop
-                return (item 3 of screenBounds as string) & "," & (item 4 of screenBounds as string)
-            end tell
-            """
-            result = self._run_applescript(script)
+            # One complete statement per line so the interactive session
+            # can execute it; the last expression's value is the result
+            script = (
+                'tell application "System Events" to set screenBounds to bounds of desktop\n'
+                '(item 3 of screenBounds as string) & "," & (item 4 of screenBounds as string)'
+            )
+            # The interactive session echoes string results quoted
+            result = self._run_applescript(script).strip().strip('"')
             width, height = map(int, result.split(","))
-            return {"ok": True, "width": width, "height": height}
+            self._screen_size = {"ok": True, "width": width, "height": height}
+            return self._screen_size
         except Exception as e:
             return {"ok": False, "error": str(e)}
 
+    def refresh_screen_size(self) -> Dict[str, Any]:
+        """Drop the memoized screen size (display hotplug) and re-probe"""
+        self._screen_size = None
+        return self._get_screen_size()
+
     def cleanup_temp_files(self) -> Dict[str, Any]:
         """Clean up temporary screenshot files"""
         try:
-            import glob
-            pattern = os.path.join(self.temp_dir, "vision_screenshot_*.png")
-            files = glob.glob(pattern)
-
             removed_count = 0
-            for file_path in files:
-                try:
-                    os.remove(file_path)
-                    removed_count += 1
-                except OSError:
-                    pass
+            # One scandir pass with unlink-by-name against an open
+            # directory fd: no glob stat per match and no path
+            # re-resolution per removal
+            use_dfd = os.unlink in os.supports_dir_fd
+            dfd = os.open(self.temp_dir, os.O_RDONLY) if use_dfd else None
+            try:
+                with os.scandir(self.temp_dir) as entries:
+                    for entry in entries:
+                        name = entry.name
+                        if not (name.startswith("vision_screenshot_")
+                                and name.endswith((".png", ".bmp"))):
+                            continue
+                        try:
+                            if dfd is not None:
+                                os.unlink(name, dir_fd=dfd)
+                            else:
+                                os.unlink(entry.path)
+                            removed_count += 1
+                        except OSError:
+                            pass
+            finally:
+                if dfd is not None:
+                    os.close(dfd)
 
             return {"ok": True, "removed_files": removed_count}
         except Exception as e:
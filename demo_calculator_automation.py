@@ -4,10 +4,8 @@ Demo: Real Calculator App Automation
 Shows actual browser controller and UI automation capabilities
 """
 
-import subprocess
 import time
 import sys
-import os
 
 # Add current directory to path
 sys.path.append('.')
@@ -23,10 +21,11 @@ def demo_calculator_automation():
     print()
 
     try:
-        # Import our automation controllers
+        # Import our automation controllers. The browser controller is
+        # imported later, right before it is used: pulling in Playwright
+        # costs seconds and the calculator steps don't need it.
         from controllers.app_controller_macos import MacApp, launch_any_app
         from controllers.calculator_optimized import OptimizedCalculatorController
-        from controllers.browser_controller import BrowserController
 
         print("✅ Controllers imported successfully")
 
@@ -36,19 +35,21 @@ def demo_calculator_automation():
         print(f"Calculator launch result: {result}")
         time.sleep(2)  # Wait for app to open
 
-        # Step 2: Use optimized Calculator automation
+        # Step 2: Use optimized Calculator automation. calculate() runs
+        # activate/clear/type as one AppleScript and already returns the
+        # display value, so there is no separate read step to pay for.
         print("\n🤖 Step 2: Automating calculation: 89.76 * 0.15...")
         calc = OptimizedCalculatorController()
         calc_result = calc.calculate("89.76*0.15")
         print(f"Calculation result: {calc_result}")
 
-        # Step 3: Read Calculator display
-        display_value = calc.get_display()
-        print(f"Calculator display shows: {display_value}")
+        if calc_result.get("ok"):
+            print(f"Calculator display shows: {calc_result['result']}")
 
         # Step 4: Browser automation
         print("\n🌐 Step 4: Opening browser and pasting result...")
-        browser = BrowserController("policy.yaml", headed=True)
+        from controllers.browser_controller import get_browser
+        browser = get_browser("policy.yaml", headed=True)
         browser.goto("https://docs.new")
         time.sleep(3)  # Wait for page load
 
@@ -2,112 +2,49 @@
 import warnings
 import os
 
-# Suppress all warnings
-warnings.filterwarnings("ignore")
-os.environ["PYTHONWARNINGS"] = "ignore"
-
-# Suppress urllib3 warnings specifically
-try:
-    import urllib3
-    urllib3.disable_warnings()
-    warnings.filterwarnings("ignore", category=urllib3.exceptions.NotOpenSSLWarning)
-except:
-    pass
+# Suppress all warnings. When launched through run.sh the interpreter
+# already installed the ignore filter from PYTHONWARNINGS, so the
+# runtime setup only runs for bare `python3 run.py` invocations.
+if not os.environ.get("PYTHONWARNINGS"):
+    warnings.filterwarnings("ignore")
+    os.environ["PYTHONWARNINGS"] = "ignore"
+
+# Suppress urllib3 warnings specifically. Only when something already
+# imported it: pulling the package in here just to silence it costs a
+# full import, and the blanket ignore filter above covers it otherwise
+import sys
+if 'urllib3' in sys.modules:
+    try:
+        urllib3 = sys.modules['urllib3']
+        urllib3.disable_warnings()
+        warnings.filterwarnings("ignore", category=urllib3.exceptions.NotOpenSSLWarning)
+    except:
+        pass
+
+import argparse
+
+parser = argparse.ArgumentParser(description="Cristal Super Interpreter")
+parser.add_argument(
+    "--profile",
+    choices=("full", "scrapling", "basic"),
+    default="full",
+    help="Controllers to preload: full (everything), scrapling (no "
+         "Playwright browser), basic (no web stack)",
+)
+args = parser.parse_args()
 
 from interpreter import interpreter
 
-# Preload your controllers into the same Python process the model will use.
-init_code = r"""
-from controllers.browser_controller import BrowserController
-from controllers.scrapling_controller import ScraplingController
-from controllers.os_controller import OSController
-from controllers.app_controller_macos import MacApp, launch_any_app, windsurf, chrome, safari, vscode, terminal, finder, brave, calculator, docker
-from controllers.ui_controller import SystemUIController
-from controllers.vision_controller import VisionController
-from controllers.gesture_controller import GestureController
-from controllers.calculator_optimized import OptimizedCalculatorController, quick_calculate
-from controllers.calculator_fixed import FixedCalculatorController, fixed_calc
-from controllers.calculator_jxa import jxa_calc, click_calc_buttons, calc_expression, calc_209_x_3909
-from controllers.docker_controller import DockerController, get_docker_controller, quick_container_start, quick_container_stop, quick_container_list
-from controllers.memory import save_doc, list_docs, get_doc, search_docs, get_stats, quick_save
-
-browser = BrowserController("policy.yaml", headed=True)
-scraper = ScraplingController("policy.yaml")
-osctl   = OSController("policy.yaml")
-windsurf = MacApp("Windsurf")
-
-# Universal UI automation controllers
-ui = SystemUIController()
-vision = VisionController()
-gestures = GestureController()
-calc = calculator()  # Standard calculator
-calc_optimized = OptimizedCalculatorController()  # CPU-efficient calculator
-calc_fixed = fixed_calc  # Robust calculator with proven JXA automation
-jxa_calc = jxa_calc  # PROVEN JXA Calculator automation that WORKS
-
-# Docker automation controllers
-docker_app = docker()  # Native Docker Desktop app controller
-docker_controller = get_docker_controller()  # Comprehensive Docker controller with UI+CLI fallbacks
-docker_web_preferred = get_docker_controller(prefer_web=True)  # Web-interface preferred Docker controller
-
-# Memory functions are available directly
-memory_stats = get_stats()
-
-# Disable system() function to force use of automation controllers
-import builtins
-_original_system = getattr(builtins, 'system', None)
-
-def enhanced_system(command):
-    if 'open -a' in command:
-        app_name = command.split('open -a')[-1].strip().strip('"').strip("'")
-        print(f"🚀 REDIRECTING: system('{command}') → launch_any_app('{app_name}')")
-        print(f"✅ Enhanced with UI automation capabilities")
-        return launch_any_app(app_name)
-    return _original_system(command) if _original_system else 0
-
-# Override system function with enhanced version
-import os
-os.system = enhanced_system
-if hasattr(builtins, 'system'):
-    builtins.system = enhanced_system
-
-# Enhanced launch_any_app with UI automation for ALL apps
-_original_launch_any_app = launch_any_app
-def smart_launch_any_app(app_name, path=None):
-    print(f"🚀 LAUNCHING {app_name} with full UI automation")
-    print(f"✅ Available automation:")
-    print(f"   - MacApp('{app_name}').click_ui('button', 'name')")
-    print(f"   - MacApp('{app_name}').type_text('content')")
-    print(f"   - MacApp('{app_name}').menu_click(['File', 'New'])")
-
-    if 'Calculator' in app_name:
-        print(f"🧮 Calculator-specific automation:")
-        print(f"   - calc_optimized.calculate('8208*2083') # CPU-efficient")
-        print(f"   - calc.calculator_click_buttons(['8','2','0','8','*','2','0','8','3','='])")
-
-    if 'Docker' in app_name:
-        print(f"🐳 Docker-specific automation:")
-        print(f"   - docker_controller.start_container('container_name') # UI+CLI fallback")
-        print(f"   - docker_controller.list_containers() # Get all containers")
-        print(f"   - docker_app.docker_open_containers_tab() # Navigate UI")
-
-    return _original_launch_any_app(app_name, path)
-
-launch_any_app = smart_launch_any_app
-
-print(f"[setup] browser, osctl, windsurf, scraper, Docker, and memory ({memory_stats['total_docs']} docs, {memory_stats['embedding_count']} embeddings) are ready.")
-print("✅ Universal UI automation ready - click anywhere on your laptop!")
-print("🖱️  ui: System-wide clicking, scrolling, Dock/menu bar interaction")
-print("👁️  vision: Screenshot analysis, OCR text reading, image finding")
-print("🤏 gestures: Trackpad swipes, pinch zoom, force touch, smooth movements")
-print("🧮 Calculator app: FULL UI automation available - opens and clicks buttons")
-print("🐳 Docker: FULL automation - UI control + CLI fallbacks + web interface support")
-print("📱 Enhanced app automation with precise coordinate clicking")
-print("⚡ Performance optimized: No busy-loops, exponential backoff, batched commands")
-"""
-
-# Run the init code inside the model's Python environment
-interpreter.computer.run("python", init_code)
+# Preload the controllers into the same Python process the model will
+# use. The construction logic lives in controllers/_init_controllers.py,
+# a real module, so importlib's __pycache__ caches its bytecode (this
+# replaced an earlier hand-rolled marshal cache of an inline source
+# string).
+interpreter.computer.run(
+    "python",
+    "from controllers._init_controllers import setup\n"
+    f"globals().update(setup(profile={args.profile!r}))",
+)
 
 # Guide the model on how to use these controllers
 interpreter.system_message = """
@@ -0,0 +1,6 @@
+#!/bin/bash
+# Launch super_interpreter with warnings silenced before Python starts.
+# Setting PYTHONWARNINGS here lets the interpreter install the filter at
+# startup, so run.py can skip its runtime warnings setup entirely.
+export PYTHONWARNINGS=ignore
+exec python3 "$(dirname "$0")/run.py" "$@"